@@ -1,11 +1,17 @@
+import functools
+import importlib.util
 import os
+import sys
+from collections.abc import Mapping
+from types import MappingProxyType
 from typing import Any, TypedDict, cast
 
+from vintasend.utils.import_utils import import_class
 from vintasend.utils.singleton_utils import SingletonMeta
 
 
 class NotificationSettingsDict(TypedDict):
-    NOTIFICATION_ADAPTERS: list[tuple[str, str]]
+    NOTIFICATION_ADAPTERS: tuple[tuple[str, str], ...]
     NOTIFICATION_BACKEND: str | None
     NOTIFICATION_MODEL: str | None
     NOTIFICATION_DEFAULT_BCC_EMAILS: list[str]
@@ -13,18 +19,64 @@ class NotificationSettingsDict(TypedDict):
     NOTIFICATION_DEFAULT_BASE_URL_DOMAIN: str
     NOTIFICATION_DEFAULT_FROM_EMAIL: str 
 
-DEFAULT_SETTINGS: NotificationSettingsDict = {
-    "NOTIFICATION_ADAPTERS": [],
+SETTINGS_NAMES: tuple[str, ...] = tuple(NotificationSettingsDict.__annotations__)
+
+# Defaults are read-only so they can be safely shared by every settings lookup
+DEFAULT_SETTINGS: Mapping[str, Any] = MappingProxyType({
+    "NOTIFICATION_ADAPTERS": (),
     "NOTIFICATION_BACKEND": None,
     "NOTIFICATION_MODEL": None,
     "NOTIFICATION_DEFAULT_BCC_EMAILS": [],
     "NOTIFICATION_DEFAULT_BASE_URL_PROTOCOL": "http",
     "NOTIFICATION_DEFAULT_BASE_URL_DOMAIN": "example.com",
     "NOTIFICATION_DEFAULT_FROM_EMAIL": "foo@examplo.com",
-}
+})
+
+DJANGO_DEFAULT_SETTINGS: Mapping[str, Any] = MappingProxyType({
+    **DEFAULT_SETTINGS,
+    "NOTIFICATION_ADAPTERS": (
+        (
+            "vintasend_django.services.notification_adapters.django_email.DjangoEmailNotificationAdapter",
+            "vintasend_django.services.notification_template_renderers.django_templated_email_renderer.DjangoTemplatedEmailRenderer",
+        ),
+    ),
+    "NOTIFICATION_BACKEND": "vintasend_django.services.notification_backends.django_db_notification_backend.DjangoDbNotificationBackend",
+    "NOTIFICATION_MODEL": "vintasend_django.models.Notification",
+})
+
+FLASK_DEFAULT_SETTINGS: Mapping[str, Any] = MappingProxyType({
+    **DEFAULT_SETTINGS,
+    "NOTIFICATION_ADAPTERS": (
+        (
+            "vintasend_flask_mail.services.notification_adapters.flask_mail.FlaskMailNotificationAdapter",
+            "vintasend_jinja.services.notification_template_renderers.jinja_template_renderer.JinjaTemplatedEmailRenderer",
+        ),
+    ),
+    "NOTIFICATION_BACKEND": "vintasend_sqlalchemy.services.notification_backends.sqlalchemy_notification_backend.SQLAlchemyNotificationBackend",
+})
+
+FASTAPI_DEFAULT_SETTINGS: Mapping[str, Any] = MappingProxyType({
+    **DEFAULT_SETTINGS,
+    "NOTIFICATION_ADAPTERS": (
+        (
+            "vintasend_fastapi_mail.services.notification_adapters.fastapi_mail.FastAPIMailNotificationAdapter",
+            "vintasend_jinja.services.notification_template_renderers.jinja_template_renderer.JinjaTemplatedEmailRenderer",
+        ),
+    ),
+    "NOTIFICATION_BACKEND": "vintasend_sqlalchemy.services.notification_backends.sqlalchemy_notification_backend.SQLAlchemyNotificationBackend",
+})
+
+
+@functools.lru_cache(maxsize=None)
+def _is_module_importable(module_name: str) -> bool:
+    # Framework packages can't be installed or removed while the process is running, so
+    # probing the import system once per module is enough.
+    return importlib.util.find_spec(module_name) is not None
 
 
 def is_django_installed():
+    if not _is_module_importable("django"):
+        return False
     try:
         import django  # type: ignore # noqa # pylint: disable=unused-import
         from django.conf import settings  # type: ignore # noqa # pylint: disable=unused-import
@@ -35,6 +87,8 @@ def is_django_installed():
 
 
 def is_flask_installed():
+    if not _is_module_importable("flask"):
+        return False
     try:
         import flask  # type: ignore # noqa # pylint: disable=unused-import
 
@@ -44,81 +98,82 @@ def is_flask_installed():
 
 
 def is_fastapi_installed():
-    try:
-        import fastapi  # type: ignore # noqa # pylint: disable=unused-import
+    return _is_module_importable("fastapi")
 
-        return True
-    except ImportError:
-        return False
+
+_detected_framework: str | None = None
 
 
 def detect_framework():
+    global _detected_framework
+
+    # Once a framework is detected it won't change for the lifetime of the process. "Unknown"
+    # isn't cached because Django settings or a Flask app context may still be set up later.
+    if _detected_framework is not None:
+        return _detected_framework
+
     if is_django_installed():
-        return "Django"
+        framework = "Django"
     elif is_flask_installed():
-        return "Flask"
+        framework = "Flask"
     elif is_fastapi_installed():
-        return "FastAPI"
+        framework = "FastAPI"
     else:
         return "Unknown"
 
+    _detected_framework = framework
+    return framework
+
+
+_env_vars_cache: dict[str, str | None] = {}
+
+
+def _get_env_var(setting_name: str) -> str | None:
+    try:
+        return _env_vars_cache[setting_name]
+    except KeyError:
+        return _env_vars_cache.setdefault(setting_name, os.environ.get(setting_name))
+
+
+def clear_settings_cache():
+    """
+    Clear the cached environment variables and framework detection. Useful for tests that
+    change the environment after the settings were read for the first time.
+    """
+    global _detected_framework
+
+    _env_vars_cache.clear()
+    _detected_framework = None
+    _is_module_importable.cache_clear()
+
 
 def get_setting_with_env_var_fallback(
     setting_name: str, 
     framework_value: Any | None = None, 
-    default_settings: NotificationSettingsDict = DEFAULT_SETTINGS
+    default_settings: Mapping[str, Any] = DEFAULT_SETTINGS
 ):
-    return os.getenv(
-        setting_name,
-        framework_value if framework_value else default_settings.get(setting_name, None)
-    )
+    env_value = _get_env_var(setting_name)
+    if env_value is not None:
+        return env_value
+    if framework_value is not None:
+        return framework_value
+    default_value = default_settings.get(setting_name, None)
+    # list defaults are shared by every lookup, so each caller gets its own copy
+    return list(default_value) if isinstance(default_value, list) else default_value
 
 
 def get_django_setting(setting_name: str):
     from django.conf import settings
 
-    DJANGO_DEFAULT_SETTINGS: NotificationSettingsDict = {
-        **DEFAULT_SETTINGS,
-        "NOTIFICATION_ADAPTERS": [
-            (
-                "vintasend_django.services.notification_adapters.django_email.DjangoEmailNotificationAdapter",
-                "vintasend_django.services.notification_template_renderers.django_templated_email_renderer.DjangoTemplatedEmailRenderer",
-            ),
-        ],
-        "NOTIFICATION_BACKEND": "vintasend_django.services.notification_backends.django_db_notification_backend.DjangoDbNotificationBackend",
-        "NOTIFICATION_MODEL": "vintasend_django.models.Notification",
-    }
-
     return get_setting_with_env_var_fallback(setting_name, getattr(settings, setting_name, None), DJANGO_DEFAULT_SETTINGS)
 
 
 def get_flask_setting(setting_name: str):
     from flask import current_app  # type: ignore # noqa # pylint: disable=import-outside-toplevels
 
-    FLASK_DEFAULT_SETTINGS: NotificationSettingsDict = {
-        **DEFAULT_SETTINGS,
-        "NOTIFICATION_ADAPTERS": [
-            (
-                "vintasend_flask_mail.services.notification_adapters.flask_mail.FlaskMailNotificationAdapter",
-                "vintasend_jinja.services.notification_template_renderers.jinja_template_renderer.JinjaTemplatedEmailRenderer",
-            ),
-        ],
-        "NOTIFICATION_BACKEND": "vintasend_sqlalchemy.services.notification_backends.sqlalchemy_notification_backend.SQLAlchemyNotificationBackend",
-    }
-
     return get_setting_with_env_var_fallback(setting_name, current_app.config.get(setting_name, None), FLASK_DEFAULT_SETTINGS)
 
 def get_fastapi_setting(setting_name: str, config: Any):
-    FASTAPI_DEFAULT_SETTINGS: NotificationSettingsDict = {
-        **DEFAULT_SETTINGS,
-        "NOTIFICATION_ADAPTERS": [
-            (
-                "vintasend_fastapi_mail.services.notification_adapters.fastapi_mail.FastAPIMailNotificationAdapter",
-                "vintasend_jinja.services.notification_template_renderers.jinja_template_renderer.JinjaTemplatedEmailRenderer",
-            ),
-        ],
-        "NOTIFICATION_BACKEND": "vintasend_sqlalchemy.services.notification_backends.sqlalchemy_notification_backend.SQLAlchemyNotificationBackend",
-    }
     return get_setting_with_env_var_fallback(setting_name, getattr(config, setting_name, None), FASTAPI_DEFAULT_SETTINGS)
 
 
@@ -134,8 +189,47 @@ def get_config(setting_name: str, config: Any = None):
         return {}
 
 
+def get_all_config(config: Any = None) -> NotificationSettingsDict:
+    """
+    Get all the notification settings at once, detecting the framework and reading its
+    settings a single time instead of once per setting like get_config does.
+    """
+    framework = detect_framework()
+    if framework == "Django":
+        from django.conf import settings
+
+        framework_values = {name: getattr(settings, name, None) for name in SETTINGS_NAMES}
+        default_settings = DJANGO_DEFAULT_SETTINGS
+    elif framework == "Flask":
+        from flask import current_app  # type: ignore # noqa # pylint: disable=import-outside-toplevels
+
+        framework_values = {name: current_app.config.get(name, None) for name in SETTINGS_NAMES}
+        default_settings = FLASK_DEFAULT_SETTINGS
+    elif framework == "FastAPI":
+        framework_values = {name: getattr(config, name, None) for name in SETTINGS_NAMES}
+        default_settings = FASTAPI_DEFAULT_SETTINGS
+    else:
+        return cast(NotificationSettingsDict, {name: {} for name in SETTINGS_NAMES})
+
+    return cast(
+        NotificationSettingsDict,
+        {
+            name: get_setting_with_env_var_fallback(name, framework_values[name], default_settings)
+            for name in SETTINGS_NAMES
+        },
+    )
+
+
+def _intern_import_str(import_str: Any) -> Any:
+    if isinstance(import_str, str):
+        return sys.intern(import_str)
+    if isinstance(import_str, (list, tuple)) and isinstance(import_str[0], str):
+        return (sys.intern(import_str[0]), *import_str[1:])
+    return import_str
+
+
 class NotificationSettings(metaclass=SingletonMeta):
-    NOTIFICATION_ADAPTERS: list[tuple[str, str]]
+    NOTIFICATION_ADAPTERS: tuple[tuple[str, str], ...]
     NOTIFICATION_BACKEND: str
     NOTIFICATION_MODEL: str | None
     NOTIFICATION_DEFAULT_BCC_EMAILS: list[str]
@@ -143,18 +237,24 @@ class NotificationSettings(metaclass=SingletonMeta):
     NOTIFICATION_DEFAULT_BASE_URL_DOMAIN: str
     NOTIFICATION_DEFAULT_FROM_EMAIL: str
 
+    _notification_model_cls: Any = None
+
     def __init__(self, config: Any = None):
-        self.NOTIFICATION_ADAPTERS = cast(list[tuple[str, str]], get_config("NOTIFICATION_ADAPTERS", config))
-        self.NOTIFICATION_BACKEND = cast(str, get_config("NOTIFICATION_BACKEND", config))
-        self.NOTIFICATION_MODEL = cast(str| None, get_config("NOTIFICATION_MODEL", config))
-        self.NOTIFICATION_DEFAULT_BCC_EMAILS = cast(list[str], get_config("NOTIFICATION_DEFAULT_BCC_EMAILS", config))
-        self.NOTIFICATION_DEFAULT_BASE_URL_PROTOCOL = cast(str, get_config("NOTIFICATION_DEFAULT_BASE_URL_PROTOCOL", config))
-        self.NOTIFICATION_DEFAULT_BASE_URL_DOMAIN = cast(str, get_config("NOTIFICATION_DEFAULT_BASE_URL_DOMAIN", config))
-        self.NOTIFICATION_DEFAULT_FROM_EMAIL = cast(str, get_config("NOTIFICATION_DEFAULT_FROM_EMAIL", config))
+        # SingletonMeta only runs __init__ once per process, so settings are read a single time
+        self.__dict__.update(get_all_config(config))
+        # import strings are used as keys by the class import caches, interning them makes those
+        # lookups compare by identity
+        self.NOTIFICATION_BACKEND = _intern_import_str(self.NOTIFICATION_BACKEND)
+        if isinstance(self.NOTIFICATION_ADAPTERS, (list, tuple)):
+            self.NOTIFICATION_ADAPTERS = tuple(
+                (_intern_import_str(adapter), _intern_import_str(template_renderer))
+                for adapter, template_renderer in self.NOTIFICATION_ADAPTERS
+            )
 
     def get_notification_model_cls(self):
+        if self._notification_model_cls is not None:
+            return self._notification_model_cls
         if self.NOTIFICATION_MODEL is None:
             raise ValueError("NOTIFICATION_MODEL is not set in the settings.")
-        module_name, class_name = self.NOTIFICATION_MODEL.rsplit(".", 1)
-        module = __import__(module_name, fromlist=[class_name])
-        return getattr(module, class_name)
+        self._notification_model_cls = import_class(self.NOTIFICATION_MODEL)
+        return self._notification_model_cls
@@ -1,4 +1,4 @@
-from enum import Enum
+from enum import Enum, IntEnum, IntFlag
 
 
 class NotificationStatus(Enum):
@@ -13,4 +13,32 @@ class NotificationTypes(Enum):
     PUSH = "PUSH"
     EMAIL = "EMAIL"
     SMS = "SMS"
-    IN_APP = "IN_APP"
\ No newline at end of file
+    IN_APP = "IN_APP"
+
+
+class NotificationTypeMask(IntFlag):
+    """
+    Bit flags for NotificationTypes, so listings can filter by several types with a single
+    integer, e.g. NotificationTypeMask.EMAIL | NotificationTypeMask.IN_APP.
+    """
+
+    PUSH = 1
+    EMAIL = 2
+    SMS = 4
+    IN_APP = 8
+
+    @classmethod
+    def from_notification_type(cls, notification_type: str) -> "NotificationTypeMask":
+        return cls[NotificationTypes(notification_type).name]
+
+
+class LockMode(IntEnum):
+    """
+    How get_notification should lock the notification row. The values line up with the old
+    boolean for_update flag, so False is NONE and True is UPDATE.
+    """
+
+    NONE = 0
+    UPDATE = 1
+    SHARE = 2
+    UPDATE_SKIP_LOCKED = 3
@@ -4,16 +4,31 @@ from dataclasses import dataclass
 from typing import TypedDict
 
 
+_ALLOWED_VALUE_TYPES = (int, float, str, list, dict)
+
+
 class NotificationContextDict(dict):
     """
     A dictionary that only accepts string keys and values of types: int, float, str,
     list[NotificationContextDict], and dict[str, NotificationContextDict].
     """
 
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super().__init__()
         self.update(*args, **kwargs)
 
+    @classmethod
+    def from_validated_dict(cls, validated_dict: dict) -> "NotificationContextDict":
+        """
+        Build a NotificationContextDict from a dict whose keys and values are already known to be
+        valid (e.g. another NotificationContextDict), skipping the per-key validation.
+        """
+        instance = cls.__new__(cls)
+        dict.update(instance, validated_dict)
+        return instance
+
     def update(self, *args, **kwargs):
         for k, v in dict(*args, **kwargs).items():
             self[k] = v
@@ -26,35 +41,45 @@ class NotificationContextDict(dict):
         | str
         | list["NotificationContextDict"]
         | dict[str, "NotificationContextDict"],
+        *,
+        _isinstance=isinstance,
+        _allowed_value_types=_ALLOWED_VALUE_TYPES,
+        _dict_setitem=dict.__setitem__,
     ):
-        if not isinstance(key, str):
+        # builtins are bound as keyword-only defaults so the checks below use fast local
+        # lookups, as this runs for every key of every context
+        if not _isinstance(key, str):
             raise TypeError("Keys must be strings")
-        if not isinstance(
-            value,
-            (int | float | str | list | dict),
-        ):
+        if not _isinstance(value, _allowed_value_types):
             raise TypeError("Value must be an int, float, str, list, or dict")
-        if isinstance(value, list):
-            value = [self._validate_list_item(item) for item in value]
-        if isinstance(value, dict):
-            value = {k: self._validate_dict_value(v) for k, v in value.items()}
-        super().__setitem__(key, value)
-
-    def _validate_list_item(self, item):
-        if not isinstance(item, NotificationContextDict):
-            raise TypeError("List items must be SerializableDict instances")
-        return item
-
-    def _validate_dict_value(self, value):
-        if not isinstance(value, NotificationContextDict):
-            raise TypeError("Dict values must be SerializableDict instances")
-        return value
+        if _isinstance(value, list):
+            context_dict_cls = NotificationContextDict
+            if not all(_isinstance(item, context_dict_cls) for item in value):
+                raise TypeError("List items must be SerializableDict instances")
+            value = list(value)
+        elif _isinstance(value, dict):
+            context_dict_cls = NotificationContextDict
+            if not all(_isinstance(v, context_dict_cls) for v in value.values()):
+                raise TypeError("Dict values must be SerializableDict instances")
+            value = dict(value)
+        _dict_setitem(self, key, value)
 
     def copy(self) -> "NotificationContextDict":
-        return self.__class__(super().copy())
+        # lists and dicts get their own container, like __setitem__ gives them, so changing them
+        # doesn't change the original. The NotificationContextDicts inside them are shared.
+        return self.from_validated_dict(
+            {
+                key: list(value)
+                if isinstance(value, list)
+                else dict(value)
+                if isinstance(value, dict)
+                else value
+                for key, value in self.items()
+            }
+        )
 
 
-@dataclass
+@dataclass(slots=True)
 class Notification:
     id: int | str | uuid.UUID  # noqa: A003
     user_id: int | str | uuid.UUID
@@ -72,6 +97,23 @@ class Notification:
     adapter_extra_parameters: dict | None = None
 
 
+@dataclass(frozen=True, slots=True)
+class NotificationCursor:
+    """
+    Position of the last notification of a page, used to get the next page with keyset
+    pagination. Notifications are ordered by (send_after, id).
+    """
+
+    last_send_after: datetime.datetime | None
+    last_id: int | str | uuid.UUID
+
+
+@dataclass(slots=True)
+class NotificationPage:
+    items: list[Notification]
+    next_cursor: NotificationCursor | None
+
+
 class UpdateNotificationKwargs(TypedDict, total=False):
     title: str
     body_template: str
@@ -81,3 +123,21 @@ class UpdateNotificationKwargs(TypedDict, total=False):
     subject_template: str | None
     preheader_template: str | None
     adapter_extra_parameters: dict | None
+    context_used: dict
+    adapter_used: str
+
+
+class _PersistNotificationOptionalKwargs(TypedDict, total=False):
+    adapter_extra_parameters: dict | None
+
+
+class PersistNotificationKwargs(_PersistNotificationOptionalKwargs):
+    user_id: int | str | uuid.UUID
+    notification_type: str
+    title: str
+    body_template: str
+    context_name: str
+    context_kwargs: dict[str, uuid.UUID | str | int]
+    send_after: datetime.datetime | None
+    subject_template: str
+    preheader_template: str
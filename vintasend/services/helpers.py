@@ -1,5 +1,6 @@
-from collections.abc import Iterable
-from typing import Any, cast
+import functools
+from collections.abc import Callable, Iterable
+from typing import Any
 
 from vintasend.app_settings import NotificationSettings
 from vintasend.services.notification_adapters.asyncio_base import AsyncIOBaseNotificationAdapter
@@ -7,14 +8,17 @@ from vintasend.services.notification_adapters.base import BaseNotificationAdapte
 from vintasend.services.notification_backends.asyncio_base import AsyncIOBaseNotificationBackend
 from vintasend.services.notification_backends.base import BaseNotificationBackend
 from vintasend.services.notification_template_renderers.base import BaseNotificationTemplateRenderer
+from vintasend.utils.import_utils import import_class
 
 
+@functools.lru_cache(maxsize=None)
 def _import_class(import_string: str) -> Any:
-    module_name, class_name = import_string.rsplit(".", 1)
-    module = __import__(module_name, fromlist=[class_name])
-    return getattr(module, class_name)
+    return import_class(import_string)
 
 
+# Adapter classes are resolved and validated once per import string. Failures raise and are
+# never cached.
+@functools.lru_cache(maxsize=None)
 def get_asyncio_notification_adapter_cls(adapter_import_str: str) -> Any:
     try:
         adapter_cls = _import_class(adapter_import_str)
@@ -23,7 +27,9 @@ def get_asyncio_notification_adapter_cls(adapter_import_str: str) -> Any:
             f"Notifications Adapter Error: Could not import {adapter_import_str}"
         ) from e
 
-    if not issubclass(adapter_cls, AsyncIOBaseNotificationAdapter):
+    if not isinstance(adapter_cls, type) or not issubclass(
+        adapter_cls, AsyncIOBaseNotificationAdapter
+    ):
         raise ValueError(
             f"Notifications Adapter Error: {adapter_import_str} is not a valid AsyncIO notification adapter"
         )
@@ -31,6 +37,7 @@ def get_asyncio_notification_adapter_cls(adapter_import_str: str) -> Any:
     return adapter_cls
 
 
+@functools.lru_cache(maxsize=None)
 def get_notification_adapter_cls(adapter_import_str: str) -> Any:
     try:
         adapter_cls = _import_class(adapter_import_str)
@@ -39,7 +46,7 @@ def get_notification_adapter_cls(adapter_import_str: str) -> Any:
             f"Notifications Adapter Error: Could not import {adapter_import_str}"
         ) from e
 
-    if not issubclass(adapter_cls, BaseNotificationAdapter):
+    if not isinstance(adapter_cls, type) or not issubclass(adapter_cls, BaseNotificationAdapter):
         raise ValueError(
             f"Notifications Adapter Error: {adapter_import_str} is not a valid notification adapter"
         )
@@ -47,54 +54,90 @@ def get_notification_adapter_cls(adapter_import_str: str) -> Any:
     return adapter_cls
 
 
-def get_notification_adapters(
+def _get_notification_adapter(
+    adapter_import_str: str | tuple[str, dict[str, Any]],
+    template_renderer_import_str: str | tuple[str, dict[str, Any]],
+    backend: Any,
+    backend_kwargs: dict | None,
+    config: Any,
+    get_adapter_cls: Callable[[str], Any],
+) -> Any:
+    adapter_kwargs: dict = {}
+    if isinstance(adapter_import_str, tuple):
+        adapter_import_str, adapter_kwargs = adapter_import_str
+
+    adapter_cls = get_adapter_cls(adapter_import_str)
+
+    try:
+        return adapter_cls(
+            template_renderer_import_str,
+            backend,
+            backend_kwargs,
+            config,
+            **adapter_kwargs,
+        )
+    except Exception as e:  # noqa: BLE001
+        raise ValueError(
+            f"Notifications Adapter Error: Could not instantiate {adapter_import_str}"
+        ) from e
+
+
+def _get_notification_adapters(
     adapters_imports_strs: Iterable[
         tuple[str | tuple[str, dict[str, Any]], str | tuple[str, dict[str, Any]]]
     ]
     | None,
-    backend: str | None = None,
-    backend_kwargs: dict | None = None,
-    config: Any = None,
-) -> list[BaseNotificationAdapter]:
-    default_adapters = []
-    app_settings = NotificationSettings(config)
+    backend: str | None,
+    backend_kwargs: dict | None,
+    config: Any,
+    get_adapter_cls: Callable[[str], Any],
+    get_backend: Callable[..., Any],
+) -> list:
+    # settings are only looked up when a fallback is actually needed
     adapters_imports_strs_with_default = (
         adapters_imports_strs
         if adapters_imports_strs is not None
-        else app_settings.NOTIFICATION_ADAPTERS
+        else NotificationSettings(config).NOTIFICATION_ADAPTERS
     )
+    backend_with_default = backend if backend else NotificationSettings(config).NOTIFICATION_BACKEND
+
+    # all the adapters are built with the same backend import string and kwargs, so they share a
+    # single backend instance instead of each one instantiating its own
+    shared_backend = None
+    adapters = []
     for adapter_import_str, template_renderer_import_str in adapters_imports_strs_with_default:
-        adapter_kwargs: dict = {}
-        if isinstance(adapter_import_str, tuple):
-            adapter_import_str, adapter_kwargs = adapter_import_str
-
-        try:
-            adapter_cls = _import_class(adapter_import_str)
-        except (ImportError, ModuleNotFoundError) as e:
-            raise ValueError(
-                f"Notifications Adapter Error: Could not import {adapter_import_str}"
-            ) from e
-
-        try:
-            adapter = adapter_cls(
+        if shared_backend is None:
+            shared_backend = get_backend(backend_with_default, backend_kwargs, config)
+        adapters.append(
+            _get_notification_adapter(
+                adapter_import_str,
                 template_renderer_import_str,
-                backend if backend else app_settings.NOTIFICATION_BACKEND,
-                backend_kwargs,
+                shared_backend,
+                None,
                 config,
-                **adapter_kwargs,
-            )
-        except Exception as e:  # noqa: BLE001
-            raise ValueError(
-                f"Notifications Adapter Error: Could not instantiate {adapter_import_str}"
-            ) from e
-
-        if not isinstance(adapter, BaseNotificationAdapter):
-            raise ValueError(
-                f"Notifications Adapter Error: {adapter_import_str} is not a valid notification adapter"
+                get_adapter_cls,
             )
+        )
+    return adapters
 
-        default_adapters.append(cast(BaseNotificationAdapter, adapter))
-    return default_adapters
+
+def get_notification_adapters(
+    adapters_imports_strs: Iterable[
+        tuple[str | tuple[str, dict[str, Any]], str | tuple[str, dict[str, Any]]]
+    ]
+    | None,
+    backend: str | None = None,
+    backend_kwargs: dict | None = None,
+    config: Any = None,
+) -> list[BaseNotificationAdapter]:
+    return _get_notification_adapters(
+        adapters_imports_strs,
+        backend,
+        backend_kwargs,
+        config,
+        get_notification_adapter_cls,
+        get_notification_backend,
+    )
 
 
 def get_asyncio_notification_adapters(
@@ -106,107 +149,108 @@ def get_asyncio_notification_adapters(
     backend_kwargs: dict | None = None,
     config: Any = None,
 ) -> list[AsyncIOBaseNotificationAdapter]:
-    default_adapters = []
-    app_settings = NotificationSettings(config)
-    adapters_imports_strs_with_default = (
-        adapters_imports_strs
-        if adapters_imports_strs is not None
-        else app_settings.NOTIFICATION_ADAPTERS
+    return _get_notification_adapters(
+        adapters_imports_strs,
+        backend,
+        backend_kwargs,
+        config,
+        get_asyncio_notification_adapter_cls,
+        get_asyncio_notification_backend,
     )
-    for adapter_import_str, template_renderer_import_str in adapters_imports_strs_with_default:
-        adapter_kwargs: dict = {}
-        if isinstance(adapter_import_str, tuple):
-            adapter_import_str, adapter_kwargs = adapter_import_str
-        try:
-            adapter_cls = _import_class(adapter_import_str)
-        except (ImportError, ModuleNotFoundError) as e:
-            raise ValueError(
-                f"Notifications Adapter Error: Could not import {adapter_import_str}"
-            ) from e
-
-        try:
-            adapter = adapter_cls(
-                template_renderer_import_str,
-                backend if backend else app_settings.NOTIFICATION_BACKEND,
-                backend_kwargs,
-                config,
-                **adapter_kwargs,
-            )
-        except Exception as e:  # noqa: BLE001
-            raise ValueError(
-                f"Notifications Adapter Error: Could not instantiate {adapter_import_str}"
-            ) from e
-
-        if not isinstance(adapter, AsyncIOBaseNotificationAdapter):
-            raise ValueError(
-                f"Notifications Adapter Error: {adapter_import_str} is not a valid notification adapter"
-            )
 
-        default_adapters.append(cast(AsyncIOBaseNotificationAdapter, adapter))
-    return default_adapters
+
+@functools.lru_cache(maxsize=None)
+def get_notification_backend_cls(backend_import_str: str) -> Any:
+    try:
+        backend_cls = _import_class(backend_import_str)
+    except (ImportError, ModuleNotFoundError) as e:
+        raise ValueError(
+            f"Notifications Backend Error: Could not import {backend_import_str}"
+        ) from e
+
+    if not isinstance(backend_cls, type) or not issubclass(backend_cls, BaseNotificationBackend):
+        raise ValueError(
+            f"Notifications Backend Error: {backend_import_str} is not a valid notification backend"
+        )
+
+    return backend_cls
+
+
+@functools.lru_cache(maxsize=None)
+def get_asyncio_notification_backend_cls(backend_import_str: str) -> Any:
+    try:
+        backend_cls = _import_class(backend_import_str)
+    except (ImportError, ModuleNotFoundError) as e:
+        raise ValueError(
+            f"Notifications Backend Error: Could not import {backend_import_str}"
+        ) from e
+
+    if not isinstance(backend_cls, type) or not issubclass(
+        backend_cls, AsyncIOBaseNotificationBackend
+    ):
+        raise ValueError(
+            f"Notifications Backend Error: {backend_import_str} is not a valid AsyncIO notification backend"
+        )
+
+    return backend_cls
+
+
+@functools.lru_cache(maxsize=None)
+def get_template_renderer_cls(template_renderer_import_str: str) -> Any:
+    try:
+        template_renderer_cls = _import_class(template_renderer_import_str)
+    except (ImportError, ModuleNotFoundError) as e:
+        raise ValueError(
+            f"Notifications Template Renderer Error: Could not import {template_renderer_import_str}"
+        ) from e
+
+    if not isinstance(template_renderer_cls, type) or not issubclass(
+        template_renderer_cls, BaseNotificationTemplateRenderer
+    ):
+        raise ValueError(
+            f"Notifications Template Renderer Error: {template_renderer_import_str} is not a valid template renderer"
+        )
+
+    return template_renderer_cls
 
 
 def get_notification_backend(
     backend_import_str: str | None, backend_kwargs: dict | None = None, config: Any = None
 ) -> BaseNotificationBackend:
-    app_settings = NotificationSettings(config)
     backend_import_str_with_fallback = (
         backend_import_str
         if backend_import_str is not None
-        else app_settings.NOTIFICATION_BACKEND
+        else NotificationSettings(config).NOTIFICATION_BACKEND
     )
 
-    try:
-        backend_cls = _import_class(backend_import_str_with_fallback)
-    except (ImportError, ModuleNotFoundError) as e:
-        raise ValueError(
-            f"Notifications Backend Error: Could not import {backend_import_str_with_fallback}"
-        ) from e
+    backend_cls = get_notification_backend_cls(backend_import_str_with_fallback)
 
     try:
-        backend = backend_cls(**backend_kwargs) if backend_kwargs else backend_cls()
+        return backend_cls(**backend_kwargs) if backend_kwargs else backend_cls()
     except Exception as e:  # noqa: BLE001
         raise ValueError(
             f"Notifications Backend Error: Could not instantiate {backend_import_str_with_fallback}"
         ) from e
 
-    if not isinstance(backend, BaseNotificationBackend):
-        raise ValueError(
-            f"Notifications Backend Error: {backend_import_str_with_fallback} is not a valid notification backend"
-        )
-    return cast(BaseNotificationBackend, backend)
-
 
 def get_asyncio_notification_backend(
     backend_import_str: str | None, backend_kwargs: dict | None = None, config: Any = None
 ) -> AsyncIOBaseNotificationBackend:
-    app_settings = NotificationSettings(config)
     backend_import_str_with_fallback = (
         backend_import_str
         if backend_import_str is not None
-        else app_settings.NOTIFICATION_BACKEND
+        else NotificationSettings(config).NOTIFICATION_BACKEND
     )
 
-    try:
-        backend_cls = _import_class(backend_import_str_with_fallback)
-    except (ImportError, ModuleNotFoundError) as e:
-        raise ValueError(
-            f"Notifications Backend Error: Could not import {backend_import_str_with_fallback}"
-        ) from e
+    backend_cls = get_asyncio_notification_backend_cls(backend_import_str_with_fallback)
 
     try:
-        backend = backend_cls(**backend_kwargs) if backend_kwargs else backend_cls()
+        return backend_cls(**backend_kwargs) if backend_kwargs else backend_cls()
     except Exception as e:  # noqa: BLE001
         raise ValueError(
             f"Notifications Backend Error: Could not instantiate {backend_import_str_with_fallback}"
         ) from e
 
-    if not isinstance(backend, AsyncIOBaseNotificationBackend):
-        raise ValueError(
-            f"Notifications Backend Error: {backend_import_str_with_fallback} is not a valid AsyncIO notification backend"
-        )
-    return cast(AsyncIOBaseNotificationBackend, backend)
-
 
 def get_template_renderer(
     template_renderer_import_str: str | tuple[str, dict[str, Any]],
@@ -215,23 +259,11 @@ def get_template_renderer(
     if isinstance(template_renderer_import_str, tuple):
         template_renderer_import_str, template_renderer_kwargs = template_renderer_import_str
 
-    try:
-        template_renderer_cls = _import_class(template_renderer_import_str)
-    except (ImportError, ModuleNotFoundError) as e:
-        raise ValueError(
-            f"Notifications Template Renderer Error: Could not import {template_renderer_import_str}"
-        ) from e
+    template_renderer_cls = get_template_renderer_cls(template_renderer_import_str)
 
     try:
-        template_renderer = template_renderer_cls(**template_renderer_kwargs)
+        return template_renderer_cls(**template_renderer_kwargs)
     except Exception as e:  # noqa: BLE001
         raise ValueError(
             f"Notifications Template Renderer Error: Could not instantiate {template_renderer_import_str}"
         ) from e
-
-    if not isinstance(template_renderer, BaseNotificationTemplateRenderer):
-        raise ValueError(
-            f"Notifications Template Renderer Error: {template_renderer_import_str} is not a valid template renderer"
-        )
-
-    return cast(BaseNotificationTemplateRenderer, template_renderer)
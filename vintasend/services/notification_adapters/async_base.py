@@ -1,5 +1,6 @@
+import functools
 from abc import abstractmethod
-from typing import Any, Generic, Protocol, TypedDict, TypeVar, runtime_checkable
+from typing import Any, Generic, Protocol, TypedDict, TypeGuard, TypeVar
 
 from vintasend.services.notification_adapters.base import BaseNotificationAdapter
 from vintasend.services.notification_backends.base import BaseNotificationBackend
@@ -22,8 +23,9 @@ class NotificationDict(TypedDict):
     adapter_extra_parameters: dict | None
 
 
-@runtime_checkable
 class AsyncNotificationProtocol(Protocol):
+    __slots__ = ()
+
     def serialize_backend_kwargs(self) -> dict: ...
 
     @staticmethod
@@ -54,6 +56,8 @@ T = TypeVar("T", bound=BaseNotificationTemplateRenderer)
 class AsyncBaseNotificationAdapter(
     Generic[B, T], AsyncNotificationProtocol, BaseNotificationAdapter[B, T]
 ):
+    __slots__ = ()
+
     def serialize_backend_kwargs(self) -> dict:
         return self.backend.backend_kwargs
 
@@ -85,3 +89,10 @@ class AsyncBaseNotificationAdapter(
     @abstractmethod
     def delayed_send(self, notification_dict: NotificationDict, context_dict: dict) -> None:
         raise NotImplementedError
+
+
+@functools.lru_cache(maxsize=None)
+def is_async_adapter_cls(adapter_cls: type) -> TypeGuard[type["AsyncBaseNotificationAdapter"]]:
+    # The subclass check walks the protocol machinery, so it runs once per adapter class instead
+    # of once per notification.
+    return issubclass(adapter_cls, AsyncBaseNotificationAdapter)
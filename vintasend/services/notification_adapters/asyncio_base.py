@@ -1,11 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Any, Generic, TypeVar, cast, overload
+from typing import TYPE_CHECKING, Any, Generic, TypeVar, overload
 
 from vintasend.services.notification_backends.asyncio_base import AsyncIOBaseNotificationBackend
 from vintasend.services.notification_template_renderers.base import BaseNotificationTemplateRenderer
 
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from vintasend.constants import NotificationTypes
     from vintasend.services.dataclasses import Notification, NotificationContextDict
 
@@ -14,6 +16,26 @@ B = TypeVar("B", bound=AsyncIOBaseNotificationBackend)
 T = TypeVar("T", bound=BaseNotificationTemplateRenderer)
 
 
+_get_asyncio_notification_backend: "Callable[..., Any] | None" = None
+_get_template_renderer: "Callable[..., Any] | None" = None
+
+
+def _get_helpers() -> "tuple[Callable[..., Any], Callable[..., Any]]":
+    # helpers imports this module, so it can't be imported at the top. Binding the functions
+    # at module level on first use avoids running the import statement on every instantiation.
+    global _get_asyncio_notification_backend, _get_template_renderer
+
+    if _get_asyncio_notification_backend is None or _get_template_renderer is None:
+        from vintasend.services.helpers import (
+            get_asyncio_notification_backend,
+            get_template_renderer,
+        )
+
+        _get_asyncio_notification_backend = get_asyncio_notification_backend
+        _get_template_renderer = get_template_renderer
+    return _get_asyncio_notification_backend, _get_template_renderer
+
+
 class AsyncIOBaseNotificationAdapter(Generic[B, T], ABC):
     """
     Base class for notification adapters. All notification adapters should inherit from this class.
@@ -22,6 +44,8 @@ class AsyncIOBaseNotificationAdapter(Generic[B, T], ABC):
     marking them as sent or failed.
     """
 
+    __slots__ = ("backend", "template_renderer", "adapter_kwargs", "config")
+
     notification_type: "NotificationTypes"
 
     backend: B
@@ -29,6 +53,11 @@ class AsyncIOBaseNotificationAdapter(Generic[B, T], ABC):
     adapter_import_str: str
     adapter_kwargs: dict
 
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        # the import string only depends on the class, so it's computed once per subclass
+        cls.adapter_import_str = f"{cls.__module__}.{cls.__name__}"
+
     @overload
     def __init__(
         self,
@@ -84,25 +113,19 @@ class AsyncIOBaseNotificationAdapter(Generic[B, T], ABC):
         :param backend: The backend to use to persist the notifications.
         :param backend_kwargs: The backend kwargs to pass to the backend in case backend is an import string.
         """
-        from vintasend.services.helpers import (
-            get_asyncio_notification_backend,
-            get_template_renderer,
-        )
+        get_asyncio_notification_backend, get_template_renderer = _get_helpers()
 
         self.adapter_kwargs = kwargs
 
-        if backend is not None and isinstance(backend, AsyncIOBaseNotificationBackend):
-            self.backend = cast(B, backend)
+        if isinstance(backend, AsyncIOBaseNotificationBackend):
+            self.backend = backend  # type: ignore[assignment]
         else:
-            self.backend = cast(
-                B, get_asyncio_notification_backend(backend, backend_kwargs, config)
-            )
+            self.backend = get_asyncio_notification_backend(backend, backend_kwargs, config)
         if isinstance(template_renderer, str):
-            self.template_renderer = cast(T, get_template_renderer(template_renderer))
+            self.template_renderer = get_template_renderer(template_renderer)
         else:
-            self.template_renderer = template_renderer
+            self.template_renderer = template_renderer  # type: ignore[assignment]
 
-        self.adapter_import_str = f"{self.__module__}.{self.__class__.__name__}"
         self.config = config
 
     @abstractmethod
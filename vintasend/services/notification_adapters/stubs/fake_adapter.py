@@ -1,6 +1,9 @@
 import datetime
+import re
 import uuid
-from typing import Generic, TypeVar
+from collections import deque
+from collections.abc import Callable, Iterable
+from typing import TypeVar
 
 from vintasend.constants import NotificationTypes
 from vintasend.services.dataclasses import Notification, NotificationContextDict
@@ -12,6 +15,7 @@ from vintasend.services.notification_adapters.asyncio_base import AsyncIOBaseNot
 from vintasend.services.notification_adapters.base import BaseNotificationAdapter
 from vintasend.services.notification_backends.asyncio_base import AsyncIOBaseNotificationBackend
 from vintasend.services.notification_backends.base import BaseNotificationBackend
+from vintasend.services.notification_template_renderers.base import BaseNotificationTemplateRenderer
 from vintasend.services.notification_template_renderers.base_templated_email_renderer import (
     BaseTemplatedEmailRenderer,
 )
@@ -20,41 +24,91 @@ from vintasend.services.notification_template_renderers.base_templated_email_ren
 B = TypeVar("B", bound=BaseNotificationBackend)
 T = TypeVar("T", bound=BaseTemplatedEmailRenderer)
 
+_fromisoformat = datetime.datetime.fromisoformat
+
+# the hyphenated form and the 32 hex digits form, the hyphens are either all there or all missing
+_UUID_RE = re.compile(
+    r"\A[0-9a-f]{8}(-?)[0-9a-f]{4}\1[0-9a-f]{4}\1[0-9a-f]{4}\1[0-9a-f]{12}\Z", re.IGNORECASE
+)
+_UUID_LENGTHS = frozenset((32, 36))
+
+
+def _convert_to_uuid(value: str) -> uuid.UUID | str:
+    # only strings shaped like a serialized UUID are parsed, so other values don't go through
+    # the exception path. Checking the length first skips the regex for most other strings.
+    # Unlike uuid.UUID, the {...} and urn:uuid: forms and misplaced hyphens are kept as strings,
+    # notifications are serialized with str(uuid), which never produces them.
+    if len(value) not in _UUID_LENGTHS:
+        return value
+    return uuid.UUID(value) if _UUID_RE.match(value) else value
+
+
+def capture_sent_email(
+    sent_append: Callable[[tuple["Notification", "NotificationContextDict"]], None],
+    template_renderer: BaseNotificationTemplateRenderer,
+    notification: "Notification",
+    context: "NotificationContextDict",
+) -> None:
+    """
+    Render the notification and record it as sent with sent_append. Shared by the sync and async
+    fake adapters, which pass their sent_emails append method.
+    """
+    template_renderer.render(notification, context)
+    sent_append((notification, context))
+
+
+class FakeEmailAdapter(BaseNotificationAdapter[B, T]):
+    __slots__ = ("sent_emails",)
 
-class FakeEmailAdapter(Generic[B, T], BaseNotificationAdapter[B, T]):
     notification_type = NotificationTypes.EMAIL
     backend: B
     template_renderer: T
-    sent_emails: list[tuple["Notification", "NotificationContextDict"]] = []
+    sent_emails: deque[tuple["Notification", "NotificationContextDict"]]
+    # sent_emails is a deque rather than a list: compare it with list(adapter.sent_emails) and
+    # use itertools.islice instead of slicing. Every sent email is kept by default, subclasses
+    # can set MAX_CAPTURED to only keep the most recent ones in long test runs.
+    MAX_CAPTURED: int | None = None
 
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
-        self.sent_emails = []
+        self.sent_emails = deque(maxlen=self.MAX_CAPTURED)
 
     def send(self, notification: "Notification", context: "NotificationContextDict") -> None:
-        self.template_renderer.render(notification, context)
-        self.sent_emails.append((notification, context))
+        capture_sent_email(self.sent_emails.append, self.template_renderer, notification, context)
 
 
 BAIO = TypeVar("BAIO", bound=AsyncIOBaseNotificationBackend)
 
 
-class FakeAsyncIOEmailAdapter(Generic[BAIO, T], AsyncIOBaseNotificationAdapter[BAIO, T]):
+class FakeAsyncIOEmailAdapter(AsyncIOBaseNotificationAdapter[BAIO, T]):
+    __slots__ = ("sent_emails",)
+
     notification_type = NotificationTypes.EMAIL
     backend: BAIO
     template_renderer: T
-    sent_emails: list[tuple["Notification", "NotificationContextDict"]] = []
+    sent_emails: deque[tuple["Notification", "NotificationContextDict"]]
+    # see FakeEmailAdapter.MAX_CAPTURED
+    MAX_CAPTURED: int | None = None
 
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
-        self.sent_emails = []
+        self.sent_emails = deque(maxlen=self.MAX_CAPTURED)
 
     async def send(self, notification: "Notification", context: "NotificationContextDict") -> None:
-        self.template_renderer.render(notification, context)
-        self.sent_emails.append((notification, context))
+        # nothing here awaits, so running it inside the event loop doesn't block other tasks
+        self.send_sync(notification, context)
+
+    def send_sync(self, notification: "Notification", context: "NotificationContextDict") -> None:
+        """
+        Same as send, without creating a coroutine. Useful for tests that send many notifications
+        in a loop and don't need to go through the event loop.
+        """
+        capture_sent_email(self.sent_emails.append, self.template_renderer, notification, context)
 
 
-class FakeAsyncEmailAdapter(AsyncBaseNotificationAdapter, Generic[B, T], FakeEmailAdapter[B, T]):
+class FakeAsyncEmailAdapter(AsyncBaseNotificationAdapter, FakeEmailAdapter[B, T]):
+    __slots__ = ()
+
     notification_type = NotificationTypes.EMAIL
 
     def send(self, notification: "Notification", context: "NotificationContextDict") -> None:
@@ -62,45 +116,52 @@ class FakeAsyncEmailAdapter(AsyncBaseNotificationAdapter, Generic[B, T], FakeEma
 
     def delayed_send(self, notification_dict: NotificationDict, context_dict: dict) -> None:
         notification = self.notification_from_dict(notification_dict)
-        context = NotificationContextDict(**context_dict)
-        super().send(notification, context)
+        super().send(notification, self.context_from_dict(context_dict))
+
+    def delayed_send_many(self, jobs: Iterable[tuple[NotificationDict, dict]]) -> None:
+        """
+        Send a batch of delayed notifications with delayed_send, so subclasses that override it
+        or send handle batched jobs the same way as single ones.
+        """
+        for notification_dict, context_dict in jobs:
+            self.delayed_send(notification_dict, context_dict)
+
+    @staticmethod
+    def context_from_dict(context_dict: dict) -> NotificationContextDict:
+        # contexts that were already validated are used as is, only raw dicts are validated
+        if isinstance(context_dict, NotificationContextDict):
+            return context_dict
+        return NotificationContextDict(context_dict)
 
     def _convert_to_uuid(self, value: str) -> uuid.UUID | str:
-        try:
-            return uuid.UUID(value)
-        except ValueError:
-            return value
+        return _convert_to_uuid(value)
 
     def notification_from_dict(self, notification_dict: NotificationDict) -> "Notification":
-        send_after = (
-            datetime.datetime.fromisoformat(notification_dict["send_after"])
-            if notification_dict["send_after"]
-            else None
-        )
+        convert_to_uuid = _convert_to_uuid
+        notification_id = notification_dict["id"]
+        user_id = notification_dict["user_id"]
+        send_after_str = notification_dict["send_after"]
+        # arguments are passed positionally, in the same order as the Notification fields
         return Notification(
-            id=(
-                self._convert_to_uuid(notification_dict["id"])
-                if isinstance(notification_dict["id"], str)
-                else notification_dict["id"]
-            ),
-            user_id=(
-                self._convert_to_uuid(notification_dict["user_id"])
-                if isinstance(notification_dict["user_id"], str)
-                else notification_dict["user_id"]
+            (
+                convert_to_uuid(notification_id)
+                if type(notification_id) is str
+                else notification_id
             ),
-            context_kwargs={
-                key: self._convert_to_uuid(value) if isinstance(value, str) else value
+            convert_to_uuid(user_id) if type(user_id) is str else user_id,
+            notification_dict["notification_type"],
+            notification_dict["title"],
+            notification_dict["body_template"],
+            notification_dict["context_name"],
+            {
+                key: convert_to_uuid(value) if type(value) is str else value
                 for key, value in notification_dict["context_kwargs"].items()
             },
-            send_after=send_after,
-            status=notification_dict["status"],
-            context_used=notification_dict["context_used"],
-            notification_type=notification_dict["notification_type"],
-            title=notification_dict["title"],
-            body_template=notification_dict["body_template"],
-            context_name=notification_dict["context_name"],
-            subject_template=notification_dict["subject_template"],
-            preheader_template=notification_dict["preheader_template"],
+            _fromisoformat(send_after_str) if send_after_str else None,
+            notification_dict["subject_template"],
+            notification_dict["preheader_template"],
+            notification_dict["status"],
+            notification_dict["context_used"],
         )
 
 
@@ -1,7 +1,9 @@
-from typing import TYPE_CHECKING, Generic, TypeVar, cast
+from collections import deque
+from typing import TYPE_CHECKING, TypeVar, cast
 
 from vintasend.constants import NotificationTypes
 from vintasend.services.notification_adapters.base import BaseNotificationAdapter
+from vintasend.services.notification_adapters.stubs.fake_adapter import capture_sent_email
 from vintasend.services.notification_backends.base import BaseNotificationBackend
 from vintasend.services.notification_template_renderers.base import BaseNotificationTemplateRenderer
 
@@ -15,14 +17,17 @@ B = TypeVar("B", bound=BaseNotificationBackend)
 T = TypeVar("T", bound=BaseNotificationTemplateRenderer)
 
 
-class FakeInAppAdapter(Generic[B, T], BaseNotificationAdapter[B, T]):
+class FakeInAppAdapter(BaseNotificationAdapter[B, T]):
+    __slots__ = ("sent_emails",)
+
     notification_type = NotificationTypes.IN_APP
-    sent_emails: list[tuple["Notification", "NotificationContextDict"]] = []
+    sent_emails: deque[tuple["Notification", "NotificationContextDict"]]
+    # see FakeEmailAdapter.MAX_CAPTURED
+    MAX_CAPTURED: int | None = None
 
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
-        self.sent_emails = []
+        self.sent_emails = deque(maxlen=self.MAX_CAPTURED)
 
     def send(self, notification: "Notification", context: "NotificationContextDict") -> None:
-        self.template_renderer.render(notification, context)
-        self.sent_emails.append((notification, context))
+        capture_sent_email(self.sent_emails.append, self.template_renderer, notification, context)
@@ -2,17 +2,39 @@ import asyncio
 import datetime
 import uuid
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Iterable
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import TYPE_CHECKING, Any, ClassVar, Iterable, TypeVar
 
-from vintasend.services.utils import get_class_path
+from vintasend.constants import LockMode
+from vintasend.exceptions import NotificationNotFoundError
 
 
 if TYPE_CHECKING:
     from vintasend.services.dataclasses import Notification, UpdateNotificationKwargs
 
+
+PENDING_COLUMNS = ("id", "user_id", "status", "send_after")
+
+T = TypeVar("T")
+
+
 class AsyncIOBaseNotificationBackend(ABC):
+    __slots__ = ("backend_kwargs", "config")
+
+    backend_import_str: str
+    # The *_many defaults await one call at a time, because backends that share a single
+    # connection or session (an asyncpg connection, an SQLAlchemy AsyncSession) can't run
+    # queries on it concurrently. Backends backed by a connection pool can opt in to running up
+    # to this many calls at once.
+    MANY_CONCURRENCY: ClassVar[int] = 1
+    # See BaseNotificationBackend.MARK_SENT_STORES_CONTEXT.
+    MARK_SENT_STORES_CONTEXT: ClassVar[bool] = False
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.backend_import_str = f"{cls.__module__}.{cls.__name__}"
+
     def __init__(self, *args, **kwargs):
-        self.backend_import_str = get_class_path(self)
         self.config = kwargs.pop("config", None)
         self.backend_kwargs = kwargs
 
@@ -26,6 +48,25 @@ class AsyncIOBaseNotificationBackend(ABC):
     ) -> Iterable["Notification"]:
         ...
 
+    async def iter_pending_columns(self, page_size: int) -> AsyncIterator[dict[str, list[Any]]]:
+        """
+        Iterate over the pending notifications one page at a time, yielding each page as a dict
+        of columns (see PENDING_COLUMNS) instead of a list of Notification objects.
+
+        The pending notifications are read once, when the iteration starts, so callers can mark
+        them as sent while iterating without pages shifting under them. This default
+        implementation builds the columns from get_all_pending_notifications. Backends that can
+        query those columns directly should override it to skip hydrating notifications, paging
+        by keyset (`WHERE id > last_id`) rather than OFFSET for the same reason.
+        """
+        notifications = list(await self.get_all_pending_notifications())
+        for start in range(0, len(notifications), page_size):
+            page = notifications[start : start + page_size]
+            yield {
+                column: [getattr(notification, column) for notification in page]
+                for column in PENDING_COLUMNS
+            }
+
     @abstractmethod
     async def get_all_future_notifications(self) -> Iterable["Notification"]:
         ...
@@ -81,8 +122,15 @@ class AsyncIOBaseNotificationBackend(ABC):
 
     @abstractmethod
     async def mark_pending_as_sent(
-        self, notification_id: int | str | uuid.UUID, lock: asyncio.Lock | None = None
+        self,
+        notification_id: int | str | uuid.UUID,
+        lock: asyncio.Lock | None = None,
+        context_used: dict | None = None,
+        adapter_used: str | None = None,
     ) -> "Notification":
+        """
+        Mark a pending notification as sent. See BaseNotificationBackend.mark_pending_as_sent.
+        """
         ...
 
     @abstractmethod
@@ -103,12 +151,103 @@ class AsyncIOBaseNotificationBackend(ABC):
     ) -> None:
         ...
 
+    async def mark_pending_as_sent_many(
+        self, notification_ids: Iterable[int | str | uuid.UUID], lock: asyncio.Lock | None = None
+    ) -> list["Notification"]:
+        """
+        Mark several pending notifications as sent. This default implementation calls
+        mark_pending_as_sent for each one, see MANY_CONCURRENCY. Backends that can update all of
+        them in a single query should override it.
+        """
+        return await self._map_notification_ids(
+            lambda notification_id: self.mark_pending_as_sent(notification_id, lock),
+            notification_ids,
+        )
+
+    async def mark_pending_as_failed_many(
+        self, notification_ids: Iterable[int | str | uuid.UUID], lock: asyncio.Lock | None = None
+    ) -> list["Notification"]:
+        """
+        Mark several pending notifications as failed. See mark_pending_as_sent_many.
+        """
+        return await self._map_notification_ids(
+            lambda notification_id: self.mark_pending_as_failed(notification_id, lock),
+            notification_ids,
+        )
+
+    async def mark_sent_as_read_many(
+        self, notification_ids: Iterable[int | str | uuid.UUID], lock: asyncio.Lock | None = None
+    ) -> list["Notification"]:
+        """
+        Mark several sent notifications as read. See mark_pending_as_sent_many.
+        """
+        return await self._map_notification_ids(
+            lambda notification_id: self.mark_sent_as_read(notification_id, lock),
+            notification_ids,
+        )
+
+    async def cancel_notifications(
+        self, notification_ids: Iterable[int | str | uuid.UUID], lock: asyncio.Lock | None = None
+    ) -> None:
+        """
+        Cancel several notifications. See mark_pending_as_sent_many.
+        """
+        await self._map_notification_ids(
+            lambda notification_id: self.cancel_notification(notification_id, lock),
+            notification_ids,
+        )
+
+    async def _map_notification_ids(
+        self,
+        func: Callable[[int | str | uuid.UUID], Awaitable[T]],
+        notification_ids: Iterable[int | str | uuid.UUID],
+    ) -> list[T]:
+        if self.MANY_CONCURRENCY <= 1:
+            return [await func(notification_id) for notification_id in notification_ids]
+
+        semaphore = asyncio.Semaphore(self.MANY_CONCURRENCY)
+
+        async def call(notification_id: int | str | uuid.UUID) -> T:
+            async with semaphore:
+                return await func(notification_id)
+
+        return list(
+            await asyncio.gather(*(call(notification_id) for notification_id in notification_ids))
+        )
+
     @abstractmethod
     async def get_notification(
-        self, notification_id: int | str | uuid.UUID, for_update=False
+        self, notification_id: int | str | uuid.UUID, for_update: bool | LockMode = LockMode.NONE
     ) -> "Notification":
+        """
+        Get a notification by id. See BaseNotificationBackend.get_notification for for_update.
+        """
         ...
 
+    async def get_notifications_by_ids(
+        self, notification_ids: Iterable[int | str | uuid.UUID]
+    ) -> dict[int | str | uuid.UUID, "Notification"]:
+        """
+        Get several notifications, keyed by the ids they were requested with. See
+        BaseNotificationBackend.get_notifications_by_ids.
+        """
+        notification_ids = list(notification_ids)
+
+        async def get_notification(
+            notification_id: int | str | uuid.UUID,
+        ) -> "Notification | None":
+            try:
+                return await self.get_notification(notification_id)
+            except NotificationNotFoundError:
+                return None
+
+        results = await self._map_notification_ids(get_notification, notification_ids)
+        return {
+            notification_id: notification
+            for notification_id, notification in zip(notification_ids, results)
+            if notification is not None
+        }
+
     @abstractmethod
     async def filter_all_in_app_unread_notifications(
         self, user_id: int | str | uuid.UUID
@@ -126,14 +265,31 @@ class AsyncIOBaseNotificationBackend(ABC):
         self, notification_id: int | str | uuid.UUID
     ) -> str:
         ...
+
+    async def get_user_emails_from_notifications(
+        self, notification_ids: Iterable[int | str | uuid.UUID]
+    ) -> dict[int | str | uuid.UUID, str]:
+        """
+        Get the user email of several notifications, keyed by notification id. See
+        BaseNotificationBackend.get_user_emails_from_notifications.
+        """
+        notification_ids = list(notification_ids)
+        emails = await self._map_notification_ids(
+            self.get_user_email_from_notification, notification_ids
+        )
+        return dict(zip(notification_ids, emails))
     
-    @abstractmethod
     async def store_context_used(
-        self, 
-        notification_id: int | str | uuid.UUID, 
+        self,
+        notification_id: int | str | uuid.UUID,
         context: dict,
-        adapter_import_str: str, 
+        adapter_import_str: str,
         lock: asyncio.Lock | None = None,
     ) -> None:
-        ...
-    
\ No newline at end of file
+        """
+        Store the context and adapter a notification was sent with, without changing its status.
+        See BaseNotificationBackend.store_context_used.
+        """
+        await self.persist_notification_update(
+            notification_id, {"context_used": context, "adapter_used": adapter_import_str}, lock
+        )
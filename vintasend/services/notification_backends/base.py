@@ -1,34 +1,142 @@
 import datetime
+import functools
+import heapq
 import uuid
 from abc import ABC, abstractmethod
-from collections.abc import Iterable
-from typing import TYPE_CHECKING, Any
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, ClassVar
 
-from vintasend.services.utils import get_class_path
+from vintasend.constants import (
+    LockMode,
+    NotificationStatus,
+    NotificationTypeMask,
+    NotificationTypes,
+)
+from vintasend.exceptions import NotificationNotFoundError
+from vintasend.services.dataclasses import NotificationCursor, NotificationPage
 
 
 if TYPE_CHECKING:
     from vintasend.services.dataclasses import (
         Notification,
+        PersistNotificationKwargs,
         UpdateNotificationKwargs,
     )
 
 
+_MIN_SEND_AFTER = datetime.datetime.min.replace(tzinfo=datetime.timezone.utc)
+
+
+def _cursor_key(
+    send_after: datetime.datetime | None, notification_id: int | str | uuid.UUID
+) -> tuple[datetime.datetime, str]:
+    # notifications without send_after come first, ids are compared as strings so int, str and
+    # UUID ids can be ordered together
+    return (send_after if send_after is not None else _MIN_SEND_AFTER, str(notification_id))
+
+
+def filter_type_mask(
+    notifications: Iterable["Notification"], type_mask: NotificationTypeMask | None
+) -> Iterable["Notification"]:
+    """
+    Keep the notifications whose type is in type_mask, all of them if it's None.
+    """
+    if type_mask is None:
+        return notifications
+    return (
+        n
+        for n in notifications
+        if NotificationTypeMask.from_notification_type(n.notification_type) & type_mask
+    )
+
+
+def paginate_after_cursor(
+    notifications: Iterable["Notification"], cursor: NotificationCursor | None, limit: int
+) -> NotificationPage:
+    """
+    Keyset-paginate notifications in memory, returning the ones that come after cursor in
+    (send_after, id) order.
+    """
+    if cursor is not None:
+        cursor_key = _cursor_key(cursor.last_send_after, cursor.last_id)
+        notifications = (n for n in notifications if _cursor_key(n.send_after, n.id) > cursor_key)
+    items = heapq.nsmallest(limit + 1, notifications, key=lambda n: _cursor_key(n.send_after, n.id))
+    if len(items) <= limit:
+        return NotificationPage(items=items, next_cursor=None)
+    items.pop()
+    last_notification = items[-1]
+    return NotificationPage(
+        items=items,
+        next_cursor=NotificationCursor(
+            last_send_after=last_notification.send_after, last_id=last_notification.id
+        ),
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class IndexSpec:
+    """
+    An index a database backend should create on its notifications table. where is an optional
+    condition for a partial index.
+    """
+
+    columns: tuple[str, ...]
+    where: str | None = None
+
+
 class BaseNotificationBackend(ABC):
+    # Subclasses that declare their own __slots__ get instances without a __dict__, the ones
+    # that don't keep working as before.
+    __slots__ = ("backend_kwargs", "config")
+
     backend_import_str: str
     backend_kwargs: dict
     config: Any
 
+    # Indexes matching the filters and ordering of the pending, future and in-app unread queries.
+    # Database backends should create them (e.g. in their migrations), otherwise those queries
+    # end up scanning the whole notifications table.
+    required_indexes: ClassVar[tuple[IndexSpec, ...]] = (
+        IndexSpec(
+            columns=("status", "send_after", "id"),
+            where=f"status = '{NotificationStatus.PENDING_SEND.value}'",
+        ),
+        IndexSpec(columns=("user_id", "status", "send_after")),
+        IndexSpec(
+            columns=("user_id",),
+            where=(
+                f"status = '{NotificationStatus.SENT.value}' "
+                f"AND notification_type = '{NotificationTypes.IN_APP.value}'"
+            ),
+        ),
+    )
+
+    # number of notifications fetched per query by the iter_* methods
+    ITER_CHUNK_SIZE = 500
+    # Backends whose mark_pending_as_sent takes context_used and adapter_used set this to True.
+    # Otherwise the services mark the notification as sent and then call store_context_used.
+    MARK_SENT_STORES_CONTEXT: ClassVar[bool] = False
+
     class Meta:
         abstract = True
 
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        # the import string only depends on the class, so it's computed once per subclass
+        cls.backend_import_str = f"{cls.__module__}.{cls.__name__}"
+
     def __init__(self, *args, **kwargs):
-        self.backend_import_str = get_class_path(self)
         self.config = kwargs.pop("config", None)
         self.backend_kwargs = kwargs
 
     @abstractmethod
     def get_all_pending_notifications(self) -> Iterable["Notification"]:
+        """
+        Get all pending notifications. Callers iterate over the result only once, so it can be a
+        generator: database backends should stream the rows from a server-side cursor (e.g. a
+        named cursor with itersize set in psycopg) instead of fetching them all into a list.
+        """
         raise NotImplementedError
 
     @abstractmethod
@@ -37,6 +145,9 @@ class BaseNotificationBackend(ABC):
 
     @abstractmethod
     def get_all_future_notifications(self) -> Iterable["Notification"]:
+        """
+        Get all future notifications. See get_all_pending_notifications.
+        """
         raise NotImplementedError
 
     @abstractmethod
@@ -47,6 +158,9 @@ class BaseNotificationBackend(ABC):
     def get_all_future_notifications_from_user(
         self, user_id: int | str | uuid.UUID
     ) -> Iterable["Notification"]:
+        """
+        Get all future notifications of a user. See get_all_pending_notifications.
+        """
         raise NotImplementedError
 
     @abstractmethod
@@ -55,6 +169,134 @@ class BaseNotificationBackend(ABC):
     ) -> Iterable["Notification"]:
         raise NotImplementedError
 
+    def get_pending_notifications_after(
+        self,
+        cursor: NotificationCursor | None,
+        limit: int,
+        columns: frozenset[str] | None = None,
+        type_mask: NotificationTypeMask | None = None,
+    ) -> NotificationPage:
+        """
+        Get up to limit pending notifications that come after cursor, ordered by
+        (send_after, id). Pass the returned page's next_cursor to get the following page, it's
+        None on the last page.
+
+        This default implementation paginates get_all_pending_notifications in memory. Database
+        backends should override it with a `WHERE (send_after, id) > (%s, %s) ORDER BY
+        send_after, id LIMIT %s` query backed by an index on (send_after, id), so getting a page
+        doesn't get slower the further it is, like OFFSET pagination does.
+
+        columns lists the Notification attributes the caller reads, None meaning all of them.
+        Backends may then select only those columns (plus id and send_after, which the cursor
+        needs) and return lightweight objects with just those attributes, so listings can be
+        answered from a covering index. The default implementation ignores it.
+
+        type_mask restricts the page to the given notification types. Database backends can
+        store the type as an integer NotificationTypeMask column and filter with
+        `(type_mask & %s) != 0` instead of comparing strings.
+        """
+        return paginate_after_cursor(
+            filter_type_mask(self.get_all_pending_notifications(), type_mask), cursor, limit
+        )
+
+    def get_future_notifications_after(
+        self,
+        cursor: NotificationCursor | None,
+        limit: int,
+        columns: frozenset[str] | None = None,
+        type_mask: NotificationTypeMask | None = None,
+    ) -> NotificationPage:
+        """
+        Keyset-paginated version of get_future_notifications. See get_pending_notifications_after.
+        """
+        return paginate_after_cursor(
+            filter_type_mask(self.get_all_future_notifications(), type_mask), cursor, limit
+        )
+
+    def get_future_notifications_from_user_after(
+        self,
+        user_id: int | str | uuid.UUID,
+        cursor: NotificationCursor | None,
+        limit: int,
+        columns: frozenset[str] | None = None,
+        type_mask: NotificationTypeMask | None = None,
+    ) -> NotificationPage:
+        """
+        Keyset-paginated version of get_future_notifications_from_user. See
+        get_pending_notifications_after.
+        """
+        return paginate_after_cursor(
+            filter_type_mask(self.get_all_future_notifications_from_user(user_id), type_mask),
+            cursor,
+            limit,
+        )
+
+    def claim_pending_batch(self, worker_id: str, batch_size: int) -> list["Notification"]:
+        """
+        Claim up to batch_size pending notifications for worker_id, so workers running
+        concurrently never get the same notification.
+
+        This default implementation returns the first page of get_pending_notifications_after
+        and doesn't claim anything, which is only safe with a single worker. Database backends
+        should override it with one statement that selects and claims the rows atomically, e.g.
+        `UPDATE ... WHERE id IN (SELECT id ... ORDER BY send_after FOR UPDATE SKIP LOCKED LIMIT
+        %s) RETURNING *`, recording the worker in their own claim columns.
+        """
+        return self.get_pending_notifications_after(None, batch_size).items
+
+    def count_pending_estimate(self) -> int:
+        """
+        Approximate number of pending notifications, for UIs that show a total next to paginated
+        listings. Exact counts aren't part of the pagination APIs because COUNT(*) on a large
+        notifications table is slow, getting the next page is cheaper than counting everything.
+
+        This default implementation counts get_all_pending_notifications. Database backends should
+        override it with a cheap estimate, e.g. pg_class.reltuples on Postgres or a counter
+        maintained on writes.
+        """
+        return sum(1 for _ in self.get_all_pending_notifications())
+
+    def count_future_estimate(self) -> int:
+        """
+        Approximate number of future notifications. See count_pending_estimate.
+        """
+        return sum(1 for _ in self.get_all_future_notifications())
+
+    def iter_pending_notifications(self) -> Iterator["Notification"]:
+        """
+        Stream the pending notifications, fetching ITER_CHUNK_SIZE of them at a time with
+        get_pending_notifications_after. Backends that implement keyset pagination never hold
+        more than one chunk in memory, unlike get_all_pending_notifications.
+        """
+        return self._iter_pages(self.get_pending_notifications_after)
+
+    def iter_future_notifications(self) -> Iterator["Notification"]:
+        """
+        Stream the future notifications. See iter_pending_notifications.
+        """
+        return self._iter_pages(self.get_future_notifications_after)
+
+    def iter_future_notifications_from_user(
+        self, user_id: int | str | uuid.UUID
+    ) -> Iterator["Notification"]:
+        """
+        Stream the future notifications of a user. See iter_pending_notifications.
+        """
+        return self._iter_pages(
+            functools.partial(self.get_future_notifications_from_user_after, user_id)
+        )
+
+    def _iter_pages(
+        self, get_page: Callable[[NotificationCursor | None, int], NotificationPage]
+    ) -> Iterator["Notification"]:
+        cursor = None
+        while True:
+            page = get_page(cursor, self.ITER_CHUNK_SIZE)
+            yield from page.items
+            if page.next_cursor is None:
+                return
+            cursor = page.next_cursor
+
     @abstractmethod
     def persist_notification(
         self,
@@ -71,6 +313,21 @@ class BaseNotificationBackend(ABC):
     ) -> "Notification":
         raise NotImplementedError
 
+    def persist_notifications(
+        self, notifications_kwargs: Iterable["PersistNotificationKwargs"]
+    ) -> list["Notification"]:
+        """
+        Persist several notifications at once, returning them in the same order.
+
+        This default implementation calls persist_notification for each one. Database backends
+        should override it with a single multi-row INSERT (e.g. executemany or bulk_create) so
+        creating N notifications doesn't take N round-trips.
+        """
+        return [
+            self.persist_notification(**notification_kwargs)
+            for notification_kwargs in notifications_kwargs
+        ]
+
     @abstractmethod
     def persist_notification_update(
         self,
@@ -85,7 +342,18 @@ class BaseNotificationBackend(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def mark_pending_as_sent(self, notification_id: int | str | uuid.UUID) -> "Notification":
+    def mark_pending_as_sent(
+        self,
+        notification_id: int | str | uuid.UUID,
+        context_used: dict | None = None,
+        adapter_used: str | None = None,
+    ) -> "Notification":
+        """
+        Mark a pending notification as sent. When context_used and adapter_used are given, they
+        must be persisted in the same UPDATE that sets the status, so sending a notification
+        costs a single write. The services only pass them to backends that set
+        MARK_SENT_STORES_CONTEXT, for the others they call store_context_used afterwards.
+        """
         raise NotImplementedError
 
     @abstractmethod
@@ -100,12 +368,62 @@ class BaseNotificationBackend(ABC):
     def cancel_notification(self, notification_id: int | str | uuid.UUID) -> None:
         raise NotImplementedError
 
+    def mark_pending_as_sent_many(
+        self, notification_ids: Iterable[int | str | uuid.UUID]
+    ) -> list["Notification"]:
+        """
+        Mark several pending notifications as sent. This default implementation calls
+        mark_pending_as_sent for each one. Database backends should override it with a single
+        `UPDATE ... WHERE id IN (...)` query.
+        """
+        return [self.mark_pending_as_sent(notification_id) for notification_id in notification_ids]
+
+    def mark_pending_as_failed_many(
+        self, notification_ids: Iterable[int | str | uuid.UUID]
+    ) -> list["Notification"]:
+        """
+        Mark several pending notifications as failed. See mark_pending_as_sent_many.
+        """
+        return [
+            self.mark_pending_as_failed(notification_id) for notification_id in notification_ids
+        ]
+
+    def mark_sent_as_read_many(
+        self, notification_ids: Iterable[int | str | uuid.UUID]
+    ) -> list["Notification"]:
+        """
+        Mark several sent notifications as read. See mark_pending_as_sent_many.
+        """
+        return [self.mark_sent_as_read(notification_id) for notification_id in notification_ids]
+
     @abstractmethod
     def get_notification(
-        self, notification_id: int | str | uuid.UUID, for_update=False
+        self, notification_id: int | str | uuid.UUID, for_update: bool | LockMode = LockMode.NONE
     ) -> "Notification":
+        """
+        Get a notification by id. for_update tells how the row should be locked, database
+        backends should map LockMode.UPDATE_SKIP_LOCKED to `SELECT ... FOR UPDATE SKIP LOCKED`
+        so concurrent workers skip rows already taken instead of waiting on them. Booleans are
+        still accepted, LockMode(for_update) turns them into NONE or UPDATE.
+        """
         raise NotImplementedError
 
+    def get_notifications_by_ids(
+        self, notification_ids: Iterable[int | str | uuid.UUID]
+    ) -> dict[int | str | uuid.UUID, "Notification"]:
+        """
+        Get several notifications, keyed by the ids they were requested with. Ids that aren't
+        found are left out. This default implementation calls get_notification for each one.
+        Database backends should override it with a single `WHERE id = ANY(%s)` query.
+        """
+        notifications = {}
+        for notification_id in notification_ids:
+            try:
+                notifications[notification_id] = self.get_notification(notification_id)
+            except NotificationNotFoundError:
+                continue
+        return notifications
+
     @abstractmethod
     def filter_all_in_app_unread_notifications(
         self, user_id: int | str | uuid.UUID
@@ -118,15 +436,46 @@ class BaseNotificationBackend(ABC):
     ) -> Iterable["Notification"]:
         raise NotImplementedError
 
+    def filter_in_app_unread_count(self, user_id: int | str | uuid.UUID) -> int:
+        """
+        Number of in-app notifications the user hasn't read yet, e.g. for a notifications badge.
+
+        This default implementation counts filter_all_in_app_unread_notifications. Database
+        backends should override it with a COUNT query so the rows aren't fetched, backed by the
+        partial in-app unread index in required_indexes.
+        """
+        return sum(1 for _ in self.filter_all_in_app_unread_notifications(user_id))
+
     @abstractmethod
     def get_user_email_from_notification(self, notification_id: int | str | uuid.UUID) -> str:
         raise NotImplementedError
 
-    @abstractmethod
+    def get_user_emails_from_notifications(
+        self, notification_ids: Iterable[int | str | uuid.UUID]
+    ) -> dict[int | str | uuid.UUID, str]:
+        """
+        Get the user email of several notifications, keyed by notification id. This default
+        implementation calls get_user_email_from_notification for each one. Database backends
+        should override it with a single query joining notifications and users.
+        """
+        return {
+            notification_id: self.get_user_email_from_notification(notification_id)
+            for notification_id in notification_ids
+        }
+
     def store_context_used(
-        self, 
-        notification_id: int | str | uuid.UUID, 
+        self,
+        notification_id: int | str | uuid.UUID,
         context: dict,
         adapter_import_str: str,
     ) -> None:
-        raise NotImplementedError
+        """
+        Store the context and adapter a notification was sent with, without changing its status.
+        The services only call it for backends whose mark_pending_as_sent doesn't take
+        context_used and adapter_used. This default implementation goes through
+        persist_notification_update, backends whose persist_notification_update rejects sent
+        notifications must override it.
+        """
+        self.persist_notification_update(
+            notification_id, {"context_used": context, "adapter_used": adapter_import_str}
+        )
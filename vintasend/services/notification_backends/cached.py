@@ -0,0 +1,331 @@
+import contextlib
+import copy
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+from vintasend.constants import LockMode
+
+
+if TYPE_CHECKING:
+    from vintasend.services.dataclasses import Notification, UpdateNotificationKwargs
+
+
+class CachedGetNotificationMixin:
+    """
+    Opt-in cache for the get_notification point lookups of a BaseNotificationBackend. Put it
+    before the backend in the bases, e.g. `class CachedBackend(CachedGetNotificationMixin,
+    MyBackend)`.
+
+    Only lookups without a lock are cached, for at most CACHE_TTL seconds. Writes made through
+    the backend invalidate the notification, writes made by other processes are only seen once
+    the entry expires. Lookups return deep copies, hits and misses alike, so callers can't
+    change the cached notification. Lookups made by the backend itself while it writes a
+    notification skip the cache and get the stored one, so the write applies to it.
+    """
+
+    CACHE_MAX_SIZE = 10_000
+    CACHE_TTL = 60.0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._notification_cache: dict[Any, tuple[float, "Notification"]] = {}
+        # bumped on every invalidation, so a read that raced with one doesn't cache what it read
+        self._notification_generations: dict[str, int] = {}
+        # reads don't take the lock, dict get and item assignment are atomic
+        self._notification_cache_lock = threading.Lock()
+        # set while a write made through this mixin is running on the thread
+        self._notification_cache_writing = threading.local()
+
+    def get_notification(
+        self, notification_id: int | str | uuid.UUID, for_update: bool | LockMode = LockMode.NONE
+    ) -> "Notification":
+        if LockMode(for_update) is not LockMode.NONE or getattr(
+            self._notification_cache_writing, "active", False
+        ):
+            return super().get_notification(notification_id, for_update)  # type: ignore[misc]
+
+        key = str(notification_id)
+        cached = self._notification_cache.get(key)
+        now = time.monotonic()
+        if cached is not None and cached[0] > now:
+            return copy.deepcopy(cached[1])
+
+        generation = self._notification_generations.get(key, 0)
+        notification = super().get_notification(notification_id, for_update)  # type: ignore[misc]
+        with self._notification_cache_lock:
+            if self._notification_generations.get(key, 0) == generation:
+                if len(self._notification_cache) >= self.CACHE_MAX_SIZE:
+                    # dicts keep insertion order, so this drops the oldest entry
+                    self._notification_cache.pop(next(iter(self._notification_cache)), None)
+                self._notification_cache[key] = (now + self.CACHE_TTL, copy.deepcopy(notification))
+        return copy.deepcopy(notification)
+
+    def invalidate_notification(self, notification_id: int | str | uuid.UUID) -> None:
+        key = str(notification_id)
+        with self._notification_cache_lock:
+            generations = self._notification_generations
+            if key not in generations and len(generations) >= self.CACHE_MAX_SIZE:
+                generations.pop(next(iter(generations)), None)
+            generations[key] = generations.get(key, 0) + 1
+            self._notification_cache.pop(key, None)
+
+    def clear_notification_cache(self) -> None:
+        with self._notification_cache_lock:
+            self._notification_cache.clear()
+
+    def persist_notification_update(
+        self, notification_id: int | str | uuid.UUID, update_data: "UpdateNotificationKwargs"
+    ) -> "Notification":
+        with self._invalidating([notification_id]):
+            return super().persist_notification_update(  # type: ignore[misc]
+                notification_id, update_data
+            )
+
+    def mark_pending_as_sent(
+        self, notification_id: int | str | uuid.UUID, **kwargs: Any
+    ) -> "Notification":
+        # context_used and adapter_used are only passed on when given, see
+        # BaseNotificationBackend.MARK_SENT_STORES_CONTEXT
+        with self._invalidating([notification_id]):
+            return super().mark_pending_as_sent(notification_id, **kwargs)  # type: ignore[misc]
+
+    def mark_pending_as_failed(self, notification_id: int | str | uuid.UUID) -> "Notification":
+        with self._invalidating([notification_id]):
+            return super().mark_pending_as_failed(notification_id)  # type: ignore[misc]
+
+    def mark_sent_as_read(self, notification_id: int | str | uuid.UUID) -> "Notification":
+        with self._invalidating([notification_id]):
+            return super().mark_sent_as_read(notification_id)  # type: ignore[misc]
+
+    def cancel_notification(self, notification_id: int | str | uuid.UUID) -> None:
+        with self._invalidating([notification_id]):
+            super().cancel_notification(notification_id)  # type: ignore[misc]
+
+    def store_context_used(
+        self,
+        notification_id: int | str | uuid.UUID,
+        context: dict,
+        adapter_import_str: str,
+    ) -> None:
+        with self._invalidating([notification_id]):
+            super().store_context_used(  # type: ignore[misc]
+                notification_id, context, adapter_import_str
+            )
+
+    def mark_pending_as_sent_many(
+        self, notification_ids: Iterable[int | str | uuid.UUID]
+    ) -> list["Notification"]:
+        notification_ids = list(notification_ids)
+        with self._invalidating(notification_ids):
+            return super().mark_pending_as_sent_many(notification_ids)  # type: ignore[misc]
+
+    def mark_pending_as_failed_many(
+        self, notification_ids: Iterable[int | str | uuid.UUID]
+    ) -> list["Notification"]:
+        notification_ids = list(notification_ids)
+        with self._invalidating(notification_ids):
+            return super().mark_pending_as_failed_many(notification_ids)  # type: ignore[misc]
+
+    def mark_sent_as_read_many(
+        self, notification_ids: Iterable[int | str | uuid.UUID]
+    ) -> list["Notification"]:
+        notification_ids = list(notification_ids)
+        with self._invalidating(notification_ids):
+            return super().mark_sent_as_read_many(notification_ids)  # type: ignore[misc]
+
+    @contextlib.contextmanager
+    def _invalidating(self, notification_ids: list[int | str | uuid.UUID]) -> Iterator[None]:
+        # backends that load the notification through get_notification while writing must get
+        # the stored one rather than a copy, or the write would be applied to the copy
+        writing = self._notification_cache_writing
+        was_writing = getattr(writing, "active", False)
+        writing.active = True
+        try:
+            yield
+        finally:
+            writing.active = was_writing
+            self._invalidate_notifications(notification_ids)
+
+    def _invalidate_notifications(self, notification_ids: Iterable[int | str | uuid.UUID]) -> None:
+        for notification_id in notification_ids:
+            self.invalidate_notification(notification_id)
+
+
+class CachedInAppUnreadMixin:
+    """
+    Opt-in stale-while-revalidate cache for the first page of filter_in_app_unread_notifications,
+    which UIs tend to poll. Put it before the backend in the bases, like
+    CachedGetNotificationMixin.
+
+    Callers that pass stale_ok=True get the cached page if it's younger than
+    UNREAD_CACHE_MAX_STALENESS seconds. Once it's older than UNREAD_CACHE_REFRESH_AFTER seconds,
+    it's also refreshed in the background so the next poll gets a fresher one. Writes made
+    through the backend to one of the user's notifications drop their cached pages.
+
+    The default submit_unread_refresh runs the refresh in a worker thread, which calls the
+    backend's filter_in_app_unread_notifications from that thread. Backends whose connections
+    or sessions can't be shared across threads must override it, e.g. to run the refresh inline
+    or to queue it on a task runner. Call close() to stop the worker thread.
+    """
+
+    UNREAD_CACHE_REFRESH_AFTER = 5.0
+    UNREAD_CACHE_MAX_STALENESS = 30.0
+    UNREAD_GENERATIONS_MAX_SIZE = 10_000
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._unread_cache: dict[tuple[str, int], tuple[float, list["Notification"]]] = {}
+        self._unread_refreshing: set[tuple[str, int]] = set()
+        self._unread_refresh_lock = threading.Lock()
+        self._unread_refresh_executor: ThreadPoolExecutor | None = None
+        # bumped on every invalidation, so a fetch that raced with one doesn't cache what it read.
+        # clear_unread_cache bumps the global one, which covers every user.
+        self._unread_generations: dict[str, int] = {}
+        self._unread_clear_generation = 0
+        # the refresh thread writes to the cache, so writes and invalidation scans take the lock
+        self._unread_cache_lock = threading.Lock()
+
+    def filter_in_app_unread_notifications(
+        self,
+        user_id: int | str | uuid.UUID,
+        page: int,
+        page_size: int,
+        stale_ok: bool = False,
+    ) -> Iterable["Notification"]:
+        if page != 1:
+            return super().filter_in_app_unread_notifications(  # type: ignore[misc]
+                user_id, page, page_size
+            )
+
+        key = (str(user_id), page_size)
+        cached = self._unread_cache.get(key)
+        if stale_ok and cached is not None:
+            age = time.monotonic() - cached[0]
+            if age < self.UNREAD_CACHE_MAX_STALENESS:
+                if age >= self.UNREAD_CACHE_REFRESH_AFTER:
+                    self._schedule_unread_refresh(user_id, page_size)
+                # the cached list is shared between callers, so each one gets its own copy
+                return list(cached[1])
+
+        return list(self._fetch_unread_first_page(user_id, page_size))
+
+    def persist_notification_update(
+        self, notification_id: int | str | uuid.UUID, update_data: "UpdateNotificationKwargs"
+    ) -> "Notification":
+        notification = super().persist_notification_update(  # type: ignore[misc]
+            notification_id, update_data
+        )
+        self.invalidate_unread_cache(notification.user_id)
+        return notification
+
+    def mark_pending_as_sent(
+        self, notification_id: int | str | uuid.UUID, **kwargs: Any
+    ) -> "Notification":
+        # see CachedGetNotificationMixin.mark_pending_as_sent
+        notification = super().mark_pending_as_sent(  # type: ignore[misc]
+            notification_id, **kwargs
+        )
+        self.invalidate_unread_cache(notification.user_id)
+        return notification
+
+    def mark_sent_as_read(self, notification_id: int | str | uuid.UUID) -> "Notification":
+        notification = super().mark_sent_as_read(notification_id)  # type: ignore[misc]
+        self.invalidate_unread_cache(notification.user_id)
+        return notification
+
+    def cancel_notification(self, notification_id: int | str | uuid.UUID) -> None:
+        super().cancel_notification(notification_id)  # type: ignore[misc]
+        # cancel_notification doesn't return the notification, so its user isn't known
+        self.clear_unread_cache()
+
+    def mark_pending_as_sent_many(
+        self, notification_ids: Iterable[int | str | uuid.UUID]
+    ) -> list["Notification"]:
+        notifications = super().mark_pending_as_sent_many(notification_ids)  # type: ignore[misc]
+        self._invalidate_unread_caches(notifications)
+        return notifications
+
+    def mark_sent_as_read_many(
+        self, notification_ids: Iterable[int | str | uuid.UUID]
+    ) -> list["Notification"]:
+        notifications = super().mark_sent_as_read_many(notification_ids)  # type: ignore[misc]
+        self._invalidate_unread_caches(notifications)
+        return notifications
+
+    def invalidate_unread_cache(self, user_id: int | str | uuid.UUID) -> None:
+        user_key = str(user_id)
+        with self._unread_cache_lock:
+            generations = self._unread_generations
+            if user_key not in generations and len(generations) >= self.UNREAD_GENERATIONS_MAX_SIZE:
+                # dicts keep insertion order, so this drops the oldest entry
+                generations.pop(next(iter(generations)), None)
+            generations[user_key] = generations.get(user_key, 0) + 1
+            for key in [key for key in self._unread_cache if key[0] == user_key]:
+                self._unread_cache.pop(key, None)
+
+    def clear_unread_cache(self) -> None:
+        with self._unread_cache_lock:
+            self._unread_clear_generation += 1
+            self._unread_cache.clear()
+
+    def submit_unread_refresh(self, refresh: Callable[[], None]) -> None:
+        """
+        Run refresh, which fetches a user's first unread page again and caches it, in the
+        background. See the class docstring for when to override it.
+        """
+        with self._unread_refresh_lock:
+            if self._unread_refresh_executor is None:
+                self._unread_refresh_executor = ThreadPoolExecutor(max_workers=1)
+            self._unread_refresh_executor.submit(refresh)
+
+    def close(self) -> None:
+        """
+        Stop the background refresh thread, waiting for a running refresh to finish.
+        """
+        with self._unread_refresh_lock:
+            executor, self._unread_refresh_executor = self._unread_refresh_executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _invalidate_unread_caches(self, notifications: Iterable["Notification"]) -> None:
+        for user_id in {str(notification.user_id) for notification in notifications}:
+            self.invalidate_unread_cache(user_id)
+
+    def _fetch_unread_first_page(
+        self, user_id: int | str | uuid.UUID, page_size: int
+    ) -> list["Notification"]:
+        user_key = str(user_id)
+        generation = (self._unread_clear_generation, self._unread_generations.get(user_key, 0))
+        fetched_at = time.monotonic()
+        notifications = list(
+            super().filter_in_app_unread_notifications(  # type: ignore[misc]
+                user_id, 1, page_size
+            )
+        )
+        with self._unread_cache_lock:
+            if generation == (
+                self._unread_clear_generation,
+                self._unread_generations.get(user_key, 0),
+            ):
+                self._unread_cache[(user_key, page_size)] = (fetched_at, notifications)
+        return notifications
+
+    def _schedule_unread_refresh(self, user_id: int | str | uuid.UUID, page_size: int) -> None:
+        key = (str(user_id), page_size)
+        with self._unread_refresh_lock:
+            if key in self._unread_refreshing:
+                return
+            self._unread_refreshing.add(key)
+
+        def refresh() -> None:
+            try:
+                self._fetch_unread_first_page(user_id, page_size)
+            finally:
+                with self._unread_refresh_lock:
+                    self._unread_refreshing.discard(key)
+
+        self.submit_unread_refresh(refresh)
@@ -1,142 +1,346 @@
 import asyncio
+import contextlib
+import dataclasses
 import datetime
+import functools
+import itertools
 import json
+import operator
 import os
+import stat
+import tempfile
 import uuid
+from collections.abc import Iterable, Iterator
 from decimal import Decimal
 
-from vintasend.constants import NotificationStatus, NotificationTypes
+from vintasend.constants import LockMode, NotificationStatus, NotificationTypes
 from vintasend.exceptions import NotificationNotFoundError
 from vintasend.services.dataclasses import Notification, UpdateNotificationKwargs
 from vintasend.services.notification_backends.asyncio_base import AsyncIOBaseNotificationBackend
 from vintasend.services.notification_backends.base import BaseNotificationBackend
 
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+def _json_default(value):
+    if isinstance(value, Notification):
+        return {field.name: getattr(value, field.name) for field in dataclasses.fields(value)}
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _dumps(data: list[Notification] | dict) -> bytes:
+    # orjson serializes dataclasses, datetimes and UUIDs natively, the json fallback needs
+    # _json_default for them
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, default=_json_default).encode("utf-8")
+
+
+def _loads(data: bytes) -> list[dict] | dict:
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch the latter
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+_get_required_fields = operator.itemgetter(
+    "id",
+    "user_id",
+    "notification_type",
+    "title",
+    "body_template",
+    "context_name",
+    "context_kwargs",
+    "send_after",
+    "subject_template",
+    "preheader_template",
+    "status",
+)
+
+
+def _build_notification(notification: dict) -> Notification:
+    (
+        notification_id,
+        user_id,
+        notification_type,
+        title,
+        body_template,
+        context_name,
+        context_kwargs,
+        send_after,
+        subject_template,
+        preheader_template,
+        status,
+    ) = _get_required_fields(notification)
+    return Notification(
+        # ids loaded from the file are always str, like the ones persist_notification creates
+        id=str(notification_id),
+        user_id=user_id,
+        notification_type=notification_type,
+        title=title,
+        body_template=body_template,
+        context_name=context_name,
+        context_kwargs=context_kwargs,
+        send_after=datetime.datetime.fromisoformat(send_after) if send_after else None,
+        subject_template=subject_template,
+        preheader_template=preheader_template,
+        status=status,
+        context_used=notification.get("context_used"),
+        adapter_used=notification.get("adapter_used"),
+        adapter_extra_parameters=notification.get("adapter_extra_parameters"),
+    )
+
+
+@functools.cache
+def _get_new_file_mode() -> int:
+    # the mode open() would give a new file. The umask can only be read by setting it, so it's
+    # read once.
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def _write_atomically(file_name: str, data: bytes) -> None:
+    # readers see either the old file or the new one, never a truncated one
+    temporary_file = tempfile.NamedTemporaryFile(
+        "wb", dir=os.path.dirname(os.path.abspath(file_name)), delete=False
+    )
+    try:
+        with temporary_file:
+            temporary_file.write(data)
+        # NamedTemporaryFile creates the file as 0600, the database file keeps its own mode
+        try:
+            mode = stat.S_IMODE(os.stat(file_name).st_mode)
+        except FileNotFoundError:
+            mode = _get_new_file_mode()
+        os.chmod(temporary_file.name, mode)
+        os.replace(temporary_file.name, file_name)
+    except BaseException:
+        os.remove(temporary_file.name)
+        raise
+
+
+def _replay_journal(data: bytes) -> tuple[list[dict], int]:
+    """
+    Rebuild the notifications stored by the fake file backends. The file holds one JSON value per
+    line: lists are full snapshots, written by _store_notifications, and dicts are journal entries
+    appended by _append_journal since the last snapshot. Returns the notifications and the number
+    of journal entries replayed. A line that isn't valid JSON, e.g. an interrupted write, ends the
+    replay.
+    """
+    notifications: dict[str, dict] = {}
+    journal_length = 0
+    for line in data.splitlines():
+        try:
+            entry = _loads(line)
+        except json.JSONDecodeError:
+            break
+        if isinstance(entry, list):
+            notifications = {str(n["id"]): n for n in entry}
+            journal_length = 0
+            continue
+        journal_length += 1
+        if entry["op"] == "delete":
+            notifications.pop(str(entry["id"]), None)
+        else:
+            notifications[str(entry["notification"]["id"])] = entry["notification"]
+    return list(notifications.values()), journal_length
+
+
+class NotificationList(list[Notification]):
+    """
+    List of notifications that keeps them indexed by id, by status and, for the in-app unread
+    ones, by user, so the fake backends don't scan the whole list on every query. The indexes
+    follow the list methods, so tests can still append to or clear backend.notifications
+    directly. Status changes must go through set_status to keep them up to date, the queries
+    still check the status of what they get from the indexes.
+    """
+
+    def __init__(self, notifications: Iterable[Notification] = ()):
+        super().__init__(notifications)
+        self._rebuild_indexes()
+
+    def _rebuild_indexes(self) -> None:
+        self.by_id: dict[str, Notification] = {}
+        self.by_status: dict[str, dict[str, Notification]] = {}
+        self.in_app_unread_by_user: dict[str, dict[str, Notification]] = {}
+        for notification in self:
+            self._add_to_indexes(notification)
+
+    def _add_to_indexes(self, notification: Notification) -> None:
+        notification_id = str(notification.id)
+        self.by_id[notification_id] = notification
+        self.by_status.setdefault(notification.status, {})[notification_id] = notification
+        if (
+            notification.status == NotificationStatus.SENT.value
+            and notification.notification_type == NotificationTypes.IN_APP.value
+        ):
+            self.in_app_unread_by_user.setdefault(str(notification.user_id), {})[
+                notification_id
+            ] = notification
+
+    def _remove_from_indexes(self, notification: Notification) -> None:
+        notification_id = str(notification.id)
+        self.by_id.pop(notification_id, None)
+        self.by_status.get(notification.status, {}).pop(notification_id, None)
+        self.in_app_unread_by_user.get(str(notification.user_id), {}).pop(notification_id, None)
+
+    def set_status(self, notification: Notification, status: str) -> None:
+        self._remove_from_indexes(notification)
+        notification.status = status
+        self._add_to_indexes(notification)
+
+    def with_status(self, status: str) -> Iterable[Notification]:
+        return self.by_status.get(status, {}).values()
+
+    def append(self, notification: Notification) -> None:
+        super().append(notification)
+        self._add_to_indexes(notification)
+
+    def extend(self, notifications: Iterable[Notification]) -> None:
+        notifications = list(notifications)
+        super().extend(notifications)
+        for notification in notifications:
+            self._add_to_indexes(notification)
+
+    def __iadd__(self, notifications: Iterable[Notification]):  # type: ignore[override]
+        self.extend(notifications)
+        return self
+
+    def insert(self, index, notification: Notification) -> None:
+        super().insert(index, notification)
+        self._add_to_indexes(notification)
+
+    def remove(self, notification: Notification) -> None:
+        super().remove(notification)
+        self._remove_from_indexes(notification)
+
+    def pop(self, index=-1) -> Notification:
+        notification = super().pop(index)
+        self._remove_from_indexes(notification)
+        return notification
+
+    def clear(self) -> None:
+        super().clear()
+        self._rebuild_indexes()
+
+    def __setitem__(self, index, value) -> None:
+        super().__setitem__(index, value)
+        self._rebuild_indexes()
+
+    def __delitem__(self, index) -> None:
+        super().__delitem__(index)
+        self._rebuild_indexes()
+
+
 class FakeFileBackend(BaseNotificationBackend):
-    notifications: list[Notification]
+    notifications: NotificationList
     database_file_name: str
 
+    # Changes are appended to the file as journal entries, once there are more than this many
+    # the whole file is rewritten as a single snapshot.
+    JOURNAL_COMPACT_THRESHOLD = 1000
+    MARK_SENT_STORES_CONTEXT = True
+
     def __init__(self, database_file_name: str = "notifications.json", **kwargs):
         super().__init__(database_file_name=database_file_name, **kwargs)
         self.database_file_name = database_file_name
+        self._journal_length = 0
         try:
-            notifications_file = open(self.database_file_name, encoding="utf-8")
+            with open(self.database_file_name, "rb") as notifications_file:
+                notifications_data = notifications_file.read()
         except FileNotFoundError:
-            self.notifications = []
-            return
-        try:
-            self.notifications = [
-                self._convert_json_to_notification(n) for n in json.load(notifications_file)
-            ]
-            notifications_file.close()
-        except json.JSONDecodeError:
-            self.notifications = []
+            self.notifications = NotificationList()
             return
+        stored_notifications, self._journal_length = _replay_journal(notifications_data)
+        self.notifications = NotificationList(map(_build_notification, stored_notifications))
 
     def clear(self):
-        self.notifications = []
+        self.notifications = NotificationList()
+        self._journal_length = 0
         try:
             os.remove(self.database_file_name)
         except FileNotFoundError:
             pass
 
     def get_future_notifications(self, page: int, page_size: int) -> list[Notification]:
-        return self.__paginate_notifications(self.get_all_future_notifications(), page, page_size)
+        return self.__paginate_notifications(self._filter_future_notifications(), page, page_size)
 
     def get_future_notifications_from_user(
         self, user_id: int | str | uuid.UUID, page: int, page_size: int
     ) -> list[Notification]:
         return self.__paginate_notifications(
-            self.get_all_future_notifications_from_user(user_id), page, page_size
+            self._filter_future_notifications_from_user(user_id), page, page_size
         )
 
     def get_all_future_notifications(self) -> list[Notification]:
-        return [
+        return list(self._filter_future_notifications())
+
+    def _filter_future_notifications(self) -> Iterator[Notification]:
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
+        pending_send = NotificationStatus.PENDING_SEND.value
+        return (
             n
-            for n in self.notifications
-            if n.status == NotificationStatus.PENDING_SEND.value
-            and (
-                n.send_after is not None
-                and n.send_after > datetime.datetime.now(tz=datetime.timezone.utc)
-            )
-        ]
+            for n in self.notifications.with_status(pending_send)
+            if n.status == pending_send and n.send_after is not None and n.send_after > now
+        )
 
     def get_all_future_notifications_from_user(
         self, user_id: int | str | uuid.UUID
     ) -> list[Notification]:
-        return [
+        return list(self._filter_future_notifications_from_user(user_id))
+
+    def _filter_future_notifications_from_user(
+        self, user_id: int | str | uuid.UUID
+    ) -> Iterator[Notification]:
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
+        pending_send = NotificationStatus.PENDING_SEND.value
+        target_user_id = str(user_id)
+        return (
             n
-            for n in self.notifications
-            if n.status == NotificationStatus.PENDING_SEND.value
-            and (
-                n.send_after is not None
-                and n.send_after > datetime.datetime.now(tz=datetime.timezone.utc)
-            )
-            and str(n.user_id) == str(user_id)
-        ]
+            for n in self.notifications.with_status(pending_send)
+            if n.status == pending_send
+            and n.send_after is not None
+            and n.send_after > now
+            and str(n.user_id) == target_user_id
+        )
 
     def get_all_pending_notifications(self) -> list[Notification]:
-        return [
+        return list(self._filter_pending_notifications())
+
+    def _filter_pending_notifications(self) -> Iterator[Notification]:
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
+        pending_send = NotificationStatus.PENDING_SEND.value
+        return (
             n
-            for n in self.notifications
-            if n.status == NotificationStatus.PENDING_SEND.value
-            and (
-                n.send_after is None
-                or n.send_after <= datetime.datetime.now(tz=datetime.timezone.utc)
-            )
-        ]
-
-    def _convert_notification_to_json(self, notification: Notification) -> dict:
-        return {
-            "id": str(notification.id),
-            "user_id": str(notification.user_id),
-            "notification_type": notification.notification_type,
-            "title": notification.title,
-            "body_template": notification.body_template,
-            "context_name": notification.context_name,
-            "context_kwargs": notification.context_kwargs,
-            "send_after": notification.send_after.isoformat() if notification.send_after else None,
-            "subject_template": notification.subject_template,
-            "preheader_template": notification.preheader_template,
-            "status": notification.status,
-            "context_used": notification.context_used,
-            "adapter_extra_parameters": notification.adapter_extra_parameters,
-        }
-
-    def _convert_json_to_notification(self, notification: dict) -> Notification:
-        return Notification(
-            id=notification["id"],
-            user_id=notification["user_id"],
-            notification_type=notification["notification_type"],
-            title=notification["title"],
-            body_template=notification["body_template"],
-            context_name=notification["context_name"],
-            context_kwargs=notification["context_kwargs"],
-            send_after=(
-                datetime.datetime.fromisoformat(notification["send_after"])
-                if notification["send_after"]
-                else None
-            ),
-            subject_template=notification["subject_template"],
-            preheader_template=notification["preheader_template"],
-            status=notification["status"],
-            context_used=notification.get("context_used"),
-            adapter_extra_parameters=notification.get("adapter_extra_parameters"),
+            for n in self.notifications.with_status(pending_send)
+            if n.status == pending_send and (n.send_after is None or n.send_after <= now)
         )
 
     def _store_notifications(self):
-        json_output_file = open(self.database_file_name, "w", encoding="utf-8")
-        json.dump(
-            [self._convert_notification_to_json(n) for n in self.notifications],
-            json_output_file,
-        )
-        json_output_file.close()
+        _write_atomically(self.database_file_name, _dumps(self.notifications) + b"\n")
+        self._journal_length = 0
+
+    def _append_journal(self, entry: dict):
+        with open(self.database_file_name, "ab") as json_output_file:
+            json_output_file.write(_dumps(entry) + b"\n")
+        self._journal_length += 1
+        if self._journal_length > self.JOURNAL_COMPACT_THRESHOLD:
+            self._store_notifications()
+
+    def _store_notification(self, notification: Notification):
+        self._append_journal({"op": "put", "notification": notification})
 
     def get_pending_notifications(self, page: int, page_size: int) -> list[Notification]:
-        # page is 1-indexed
-        return self.get_all_pending_notifications()[
-            ((page - 1) * page_size) : ((page - 1) * page_size) + page_size
-        ]
+        return self.__paginate_notifications(self._filter_pending_notifications(), page, page_size)
 
     def persist_notification(
         self,
@@ -166,7 +370,7 @@ class FakeFileBackend(BaseNotificationBackend):
             adapter_extra_parameters=adapter_extra_parameters,
         )
         self.notifications.append(notification)
-        self._store_notifications()
+        self._store_notification(notification)
         return notification
 
     def persist_notification_update(
@@ -177,80 +381,85 @@ class FakeFileBackend(BaseNotificationBackend):
         for key, value in update_data.items():
             setattr(notification, key, value)
 
-        self._store_notifications()
+        self._store_notification(notification)
         return notification
 
-    def mark_pending_as_sent(self, notification_id: int | str | uuid.UUID) -> Notification:
+    def mark_pending_as_sent(
+        self,
+        notification_id: int | str | uuid.UUID,
+        context_used: dict | None = None,
+        adapter_used: str | None = None,
+    ) -> Notification:
         notification = self.get_notification(notification_id)
-        notification.status = NotificationStatus.SENT.value
-        self._store_notifications()
+        self.notifications.set_status(notification, NotificationStatus.SENT.value)
+        if context_used is not None:
+            notification.context_used = context_used
+        if adapter_used is not None:
+            notification.adapter_used = adapter_used
+        self._store_notification(notification)
         return notification
 
     def mark_pending_as_failed(self, notification_id: int | str | uuid.UUID) -> Notification:
         notification = self.get_notification(notification_id)
-        notification.status = NotificationStatus.FAILED.value
-        self._store_notifications()
+        self.notifications.set_status(notification, NotificationStatus.FAILED.value)
+        self._store_notification(notification)
         return notification
 
     def mark_sent_as_read(self, notification_id: int | str | uuid.UUID) -> Notification:
         notification = self.get_notification(notification_id)
-        notification.status = NotificationStatus.READ.value
-        self._store_notifications()
+        self.notifications.set_status(notification, NotificationStatus.READ.value)
+        self._store_notification(notification)
         return notification
 
     def cancel_notification(self, notification_id: int | str | uuid.UUID) -> None:
         notification = self.get_notification(notification_id)
         self.notifications.remove(notification)
-        self._store_notifications()
+        self._append_journal({"op": "delete", "id": str(notification.id)})
 
     def get_notification(
-        self, notification_id: int | str | uuid.UUID, for_update=False
+        self, notification_id: int | str | uuid.UUID, for_update: bool | LockMode = LockMode.NONE
     ) -> Notification:
         try:
-            return next(n for n in self.notifications if str(n.id) == str(notification_id))
-        except StopIteration as e:
+            return self.notifications.by_id[
+                notification_id if type(notification_id) is str else str(notification_id)
+            ]
+        except KeyError as e:
             raise NotificationNotFoundError("Notification not found") from e
 
     def filter_all_in_app_unread_notifications(
         self, user_id: int | str | uuid.UUID
     ) -> list[Notification]:
-        notifications = [
+        return list(self._filter_in_app_unread_notifications(user_id))
+
+    def _filter_in_app_unread_notifications(
+        self, user_id: int | str | uuid.UUID
+    ) -> Iterator[Notification]:
+        return (
             n
-            for n in self.notifications
+            for n in self.notifications.in_app_unread_by_user.get(str(user_id), {}).values()
             if n.user_id == user_id
             and n.status == NotificationStatus.SENT.value
             and n.notification_type == NotificationTypes.IN_APP.value
-        ]
-        return notifications
+        )
 
     def filter_in_app_unread_notifications(
         self, user_id: int | str | uuid.UUID, page: int, page_size: int
     ) -> list[Notification]:
         return self.__paginate_notifications(
-            self.filter_all_in_app_unread_notifications(user_id), page, page_size
+            self._filter_in_app_unread_notifications(user_id), page, page_size
         )
 
     def __paginate_notifications(
-        self, notifications: list[Notification], page: int, page_size: int
-    ):
-        # page is 1-indexed
-        return notifications[((page - 1) * page_size) : ((page - 1) * page_size) + page_size]
+        self, notifications: Iterable[Notification], page: int, page_size: int
+    ) -> list[Notification]:
+        # page is 1-indexed, islice stops consuming the filter once the page is full
+        start = (page - 1) * page_size
+        return list(itertools.islice(notifications, start, start + page_size))
 
     def get_user_email_from_notification(self, notification_id: int | str | uuid.UUID) -> str:
         notification = self.get_notification(notification_id)
         return str(notification.context_kwargs.get("email", "testemail@example.com"))
 
-    def store_context_used(
-        self,
-        notification_id: int | str | uuid.UUID,
-        context: dict,
-        adapter_import_str: str,
-    ) -> None:
-        notification = self.get_notification(notification_id)
-        notification.context_used = context
-        notification.adapter_used = adapter_import_str
-        self._store_notifications()
-
 
 class Config:
     def __init__(self, config_a: Decimal | None = None, config_b: datetime.datetime | None = None):
@@ -267,10 +476,10 @@ class FakeFileBackendWithNonSerializableKWArgs(FakeFileBackend):
     ):
         super().__init__(database_file_name=database_file_name, config=config)
 
-    def _store_notifications(self):
+    def _append_journal(self, entry: dict):
         assert self.config.config_a == Decimal("1.0")
         assert isinstance(self.config.config_b, datetime.datetime)
-        super()._store_notifications()
+        super()._append_journal(entry)
 
 
 class InvalidBackend:
@@ -279,134 +488,124 @@ class InvalidBackend:
 
 
 class FakeAsyncIOFileBackend(AsyncIOBaseNotificationBackend):
-    notifications: list[Notification]
+    notifications: NotificationList
     database_file_name: str
 
+    JOURNAL_COMPACT_THRESHOLD = 1000
+    MARK_SENT_STORES_CONTEXT = True
+
     def __init__(self, database_file_name: str = "notifications.json", **kwargs):
         super().__init__(database_file_name=database_file_name, **kwargs)
         self.database_file_name = database_file_name
+        self._journal_length = 0
+        self._write_lock: asyncio.Lock | None = None
         try:
-            notifications_file = open(self.database_file_name, encoding="utf-8")
+            with open(self.database_file_name, "rb") as notifications_file:
+                notifications_data = notifications_file.read()
         except FileNotFoundError:
-            self.notifications = []
-            return
-        try:
-            self.notifications = [
-                self._convert_json_to_notification(n) for n in json.load(notifications_file)
-            ]
-            notifications_file.close()
-        except json.JSONDecodeError:
-            self.notifications = []
+            self.notifications = NotificationList()
             return
+        stored_notifications, self._journal_length = _replay_journal(notifications_data)
+        self.notifications = NotificationList(map(_build_notification, stored_notifications))
 
     async def clear(self):
-        self.notifications = []
+        self.notifications = NotificationList()
+        self._journal_length = 0
         try:
             os.remove(self.database_file_name)
         except FileNotFoundError:
             pass
 
     async def get_future_notifications(self, page: int, page_size: int) -> list[Notification]:
-        return self.__paginate_notifications(
-            await self.get_all_future_notifications(), page, page_size
-        )
+        return self.__paginate_notifications(self._filter_future_notifications(), page, page_size)
 
     async def get_future_notifications_from_user(
         self, user_id: int | str | uuid.UUID, page: int, page_size: int
     ) -> list[Notification]:
         return self.__paginate_notifications(
-            await self.get_all_future_notifications_from_user(user_id), page, page_size
+            self._filter_future_notifications_from_user(user_id), page, page_size
         )
 
     async def get_all_future_notifications(self) -> list[Notification]:
-        return [
+        return list(self._filter_future_notifications())
+
+    def _filter_future_notifications(self) -> Iterator[Notification]:
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
+        pending_send = NotificationStatus.PENDING_SEND.value
+        return (
             n
-            for n in self.notifications
-            if n.status == NotificationStatus.PENDING_SEND.value
-            and (
-                n.send_after is not None
-                and n.send_after > datetime.datetime.now(tz=datetime.timezone.utc)
-            )
-        ]
+            for n in self.notifications.with_status(pending_send)
+            if n.status == pending_send and n.send_after is not None and n.send_after > now
+        )
 
     async def get_all_future_notifications_from_user(
         self, user_id: int | str | uuid.UUID
     ) -> list[Notification]:
-        return [
+        return list(self._filter_future_notifications_from_user(user_id))
+
+    def _filter_future_notifications_from_user(
+        self, user_id: int | str | uuid.UUID
+    ) -> Iterator[Notification]:
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
+        pending_send = NotificationStatus.PENDING_SEND.value
+        target_user_id = str(user_id)
+        return (
             n
-            for n in self.notifications
-            if n.status == NotificationStatus.PENDING_SEND.value
-            and (
-                n.send_after is not None
-                and n.send_after > datetime.datetime.now(tz=datetime.timezone.utc)
-            )
-            and str(n.user_id) == str(user_id)
-        ]
+            for n in self.notifications.with_status(pending_send)
+            if n.status == pending_send
+            and n.send_after is not None
+            and n.send_after > now
+            and str(n.user_id) == target_user_id
+        )
 
     async def get_all_pending_notifications(self) -> list[Notification]:
-        return [
+        return list(self._filter_pending_notifications())
+
+    def _filter_pending_notifications(self) -> Iterator[Notification]:
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
+        pending_send = NotificationStatus.PENDING_SEND.value
+        return (
             n
-            for n in self.notifications
-            if n.status == NotificationStatus.PENDING_SEND.value
-            and (
-                n.send_after is None
-                or n.send_after <= datetime.datetime.now(tz=datetime.timezone.utc)
-            )
-        ]
-
-    def _convert_notification_to_json(self, notification: Notification) -> dict:
-        return {
-            "id": str(notification.id),
-            "user_id": str(notification.user_id),
-            "notification_type": notification.notification_type,
-            "title": notification.title,
-            "body_template": notification.body_template,
-            "context_name": notification.context_name,
-            "context_kwargs": notification.context_kwargs,
-            "send_after": notification.send_after.isoformat() if notification.send_after else None,
-            "subject_template": notification.subject_template,
-            "preheader_template": notification.preheader_template,
-            "status": notification.status,
-            "context_used": notification.context_used,
-        }
-
-    def _convert_json_to_notification(self, notification: dict) -> Notification:
-        return Notification(
-            id=notification["id"],
-            user_id=notification["user_id"],
-            notification_type=notification["notification_type"],
-            title=notification["title"],
-            body_template=notification["body_template"],
-            context_name=notification["context_name"],
-            context_kwargs=notification["context_kwargs"],
-            send_after=(
-                datetime.datetime.fromisoformat(notification["send_after"])
-                if notification["send_after"]
-                else None
-            ),
-            subject_template=notification["subject_template"],
-            preheader_template=notification["preheader_template"],
-            status=notification["status"],
-            context_used=notification.get("context_used"),
+            for n in self.notifications.with_status(pending_send)
+            if n.status == pending_send and (n.send_after is None or n.send_after <= now)
         )
 
     async def _store_notifications(self, lock: asyncio.Lock | None = None):
-        if lock is not None:
-            await lock.acquire()
-        json_output_file = open(self.database_file_name, "w", encoding="utf-8")
-        json.dump(
-            [self._convert_notification_to_json(n) for n in self.notifications],
-            json_output_file,
-        )
-        json_output_file.close()
-        if lock is not None:
-            lock.release()
+        async with lock if lock is not None else contextlib.nullcontext():
+            async with self._get_write_lock():
+                await self._write_snapshot()
+
+    def _get_write_lock(self) -> asyncio.Lock:
+        # Snapshots are written from a worker thread, journal appends must wait for them or they
+        # would land in the file that is about to be replaced. Created lazily so it's bound to the
+        # running event loop.
+        if self._write_lock is None:
+            self._write_lock = asyncio.Lock()
+        return self._write_lock
+
+    async def _write_snapshot(self):
+        # serialized on the event loop so the snapshot can't see a half-applied change, only the
+        # file write is moved off it
+        data = _dumps(self.notifications) + b"\n"
+        self._journal_length = 0
+        await asyncio.to_thread(_write_atomically, self.database_file_name, data)
+
+    async def _append_journal(self, entry: dict, lock: asyncio.Lock | None = None):
+        async with lock if lock is not None else contextlib.nullcontext():
+            async with self._get_write_lock():
+                with open(self.database_file_name, "ab") as json_output_file:
+                    json_output_file.write(_dumps(entry) + b"\n")
+                self._journal_length += 1
+                if self._journal_length > self.JOURNAL_COMPACT_THRESHOLD:
+                    await self._write_snapshot()
+
+    async def _store_notification(
+        self, notification: Notification, lock: asyncio.Lock | None = None
+    ):
+        await self._append_journal({"op": "put", "notification": notification}, lock)
 
     async def get_pending_notifications(self, page: int, page_size: int) -> list[Notification]:
-        pending_notifications = await self.get_all_pending_notifications()
-        return pending_notifications[
-            ((page - 1) * page_size) : ((page - 1) * page_size) + page_size
-        ]
+        return self.__paginate_notifications(self._filter_pending_notifications(), page, page_size)
 
     async def persist_notification(
         self,
@@ -437,7 +636,7 @@ class FakeAsyncIOFileBackend(AsyncIOBaseNotificationBackend):
             adapter_extra_parameters=adapter_extra_parameters,
         )
         self.notifications.append(notification)
-        await self._store_notifications(lock)
+        await self._store_notification(notification, lock)
         return notification
 
     async def persist_notification_update(
@@ -451,31 +650,39 @@ class FakeAsyncIOFileBackend(AsyncIOBaseNotificationBackend):
         for key, value in update_data.items():
             setattr(notification, key, value)
 
-        await self._store_notifications(lock)
+        await self._store_notification(notification, lock)
         return notification
 
     async def mark_pending_as_sent(
-        self, notification_id: int | str | uuid.UUID, lock: asyncio.Lock | None = None
+        self,
+        notification_id: int | str | uuid.UUID,
+        lock: asyncio.Lock | None = None,
+        context_used: dict | None = None,
+        adapter_used: str | None = None,
     ) -> Notification:
         notification = await self.get_notification(notification_id)
-        notification.status = NotificationStatus.SENT.value
-        await self._store_notifications(lock)
+        self.notifications.set_status(notification, NotificationStatus.SENT.value)
+        if context_used is not None:
+            notification.context_used = context_used
+        if adapter_used is not None:
+            notification.adapter_used = adapter_used
+        await self._store_notification(notification, lock)
         return notification
 
     async def mark_pending_as_failed(
         self, notification_id: int | str | uuid.UUID, lock: asyncio.Lock | None = None
     ) -> Notification:
         notification = await self.get_notification(notification_id)
-        notification.status = NotificationStatus.FAILED.value
-        await self._store_notifications(lock)
+        self.notifications.set_status(notification, NotificationStatus.FAILED.value)
+        await self._store_notification(notification, lock)
         return notification
 
     async def mark_sent_as_read(
         self, notification_id: int | str | uuid.UUID, lock: asyncio.Lock | None = None
     ) -> Notification:
         notification = await self.get_notification(notification_id)
-        notification.status = NotificationStatus.READ.value
-        await self._store_notifications(lock)
+        self.notifications.set_status(notification, NotificationStatus.READ.value)
+        await self._store_notification(notification, lock)
         return notification
 
     async def cancel_notification(
@@ -483,51 +690,47 @@ class FakeAsyncIOFileBackend(AsyncIOBaseNotificationBackend):
     ) -> None:
         notification = await self.get_notification(notification_id)
         self.notifications.remove(notification)
-        await self._store_notifications(lock)
+        await self._append_journal({"op": "delete", "id": str(notification.id)}, lock)
 
     async def get_notification(
-        self, notification_id: int | str | uuid.UUID, for_update=False
+        self, notification_id: int | str | uuid.UUID, for_update: bool | LockMode = LockMode.NONE
     ) -> Notification:
         try:
-            return next(n for n in self.notifications if str(n.id) == str(notification_id))
-        except StopIteration as e:
+            return self.notifications.by_id[
+                notification_id if type(notification_id) is str else str(notification_id)
+            ]
+        except KeyError as e:
             raise NotificationNotFoundError("Notification not found") from e
 
     async def filter_all_in_app_unread_notifications(
         self, user_id: int | str | uuid.UUID
     ) -> list[Notification]:
-        notifications = [
+        return list(self._filter_in_app_unread_notifications(user_id))
+
+    def _filter_in_app_unread_notifications(
+        self, user_id: int | str | uuid.UUID
+    ) -> Iterator[Notification]:
+        return (
             n
-            for n in self.notifications
+            for n in self.notifications.in_app_unread_by_user.get(str(user_id), {}).values()
             if n.user_id == user_id
             and n.status == NotificationStatus.SENT.value
             and n.notification_type == NotificationTypes.IN_APP.value
-        ]
-        return notifications
+        )
 
     async def filter_in_app_unread_notifications(
         self, user_id: int | str | uuid.UUID, page: int, page_size: int
     ) -> list[Notification]:
-        in_app_unread_notifications = await self.filter_all_in_app_unread_notifications(user_id)
-        return self.__paginate_notifications(in_app_unread_notifications, page, page_size)
+        return self.__paginate_notifications(
+            self._filter_in_app_unread_notifications(user_id), page, page_size
+        )
 
     def __paginate_notifications(
-        self, notifications: list[Notification], page: int, page_size: int
-    ):
-        return notifications[((page - 1) * page_size) : ((page - 1) * page_size) + page_size]
+        self, notifications: Iterable[Notification], page: int, page_size: int
+    ) -> list[Notification]:
+        start = (page - 1) * page_size
+        return list(itertools.islice(notifications, start, start + page_size))
 
     async def get_user_email_from_notification(self, notification_id: int | str | uuid.UUID) -> str:
         notification = await self.get_notification(notification_id)
         return str(notification.context_kwargs.get("email", "testemail@example.com"))
-
-    async def store_context_used(
-        self,
-        notification_id: int | str | uuid.UUID,
-        context: dict,
-        adapter_import_str: str,
-        lock: asyncio.Lock | None = None,
-    ) -> None:
-        notification = await self.get_notification(notification_id)
-        notification.context_used = context
-        notification.adapter_used = adapter_import_str
-        await self._store_notifications(lock)
@@ -3,7 +3,7 @@ import datetime
 import logging
 import uuid
 from collections.abc import Callable, Iterable
-from typing import Any, ClassVar, Coroutine, Generic, TypeGuard, TypeVar, cast
+from typing import Any, ClassVar, Coroutine, Generic, TypeGuard, TypeVar
 
 from vintasend.app_settings import NotificationSettings
 from vintasend.services.notification_backends.asyncio_base import AsyncIOBaseNotificationBackend
@@ -37,6 +37,7 @@ from vintasend.services.helpers import (
 from vintasend.services.notification_adapters.async_base import (
     AsyncBaseNotificationAdapter,
     NotificationDict,
+    is_async_adapter_cls,
 )
 from vintasend.services.notification_adapters.asyncio_base import AsyncIOBaseNotificationAdapter
 from vintasend.services.notification_adapters.base import BaseNotificationAdapter
@@ -100,25 +101,21 @@ class NotificationService(Generic[A, B]):
         NotificationSettings(config)
 
         if isinstance(notification_backend, BaseNotificationBackend):
-            self.notification_backend = cast(B, notification_backend)
+            self.notification_backend = notification_backend  # type: ignore[assignment]
         else:
-            self.notification_backend = cast(
-                B,
-                get_notification_backend(notification_backend, notification_backend_kwargs, config),
+            self.notification_backend = get_notification_backend(  # type: ignore[assignment]
+                notification_backend, notification_backend_kwargs, config
             )
-        self.notification_backend_import_str = get_class_path(self.notification_backend)
+        self.notification_backend_import_str = self.notification_backend.backend_import_str
 
         if notification_adapters is None or self._check_is_adapters_tuple_iterable(
             notification_adapters
         ):
-            self.notification_adapters = cast(
-                Iterable[A],
-                get_notification_adapters(
-                    notification_adapters,
-                    self.notification_backend_import_str,
-                    notification_backend_kwargs if notification_backend_kwargs is not None else {},
-                    config,
-                ),
+            self.notification_adapters = get_notification_adapters(  # type: ignore[assignment]
+                notification_adapters,
+                self.notification_backend_import_str,
+                notification_backend_kwargs if notification_backend_kwargs is not None else {},
+                config,
             )
         elif self._check_is_base_notification_adapter_iterable(notification_adapters):
             self.notification_adapters = notification_adapters
@@ -192,7 +189,7 @@ class NotificationService(Generic[A, B]):
                     notification=notification,
                     context=context,
                 )
-                if isinstance(adapter, AsyncBaseNotificationAdapter):
+                if is_async_adapter_cls(type(adapter)):
                     return
             except Exception as e:  # noqa: BLE001
                 try:
@@ -206,15 +203,21 @@ class NotificationService(Generic[A, B]):
                         ) from e
                     raise e
             try:
-                self.notification_backend.mark_pending_as_sent(notification.id)
-                self.notification_backend.store_context_used(
-                    notification.id, 
-                    context,
-                    adapter.adapter_import_str,
-                )
+                self._mark_pending_as_sent(notification.id, context, adapter.adapter_import_str)
             except NotificationUpdateError as e:
                 raise NotificationMarkSentError("Failed to mark notification as sent") from e
 
+    def _mark_pending_as_sent(
+        self, notification_id: int | str | uuid.UUID, context: dict, adapter_import_str: str
+    ) -> None:
+        if self.notification_backend.MARK_SENT_STORES_CONTEXT:
+            self.notification_backend.mark_pending_as_sent(
+                notification_id, context_used=context, adapter_used=adapter_import_str
+            )
+            return
+        self.notification_backend.mark_pending_as_sent(notification_id)
+        self.notification_backend.store_context_used(notification_id, context, adapter_import_str)
+
     def create_notification(
         self,
         user_id: int | str | uuid.UUID,
@@ -515,10 +518,10 @@ class NotificationService(Generic[A, B]):
             if adapter.notification_type.value != notification_dict.get("notification_type"):
                 continue
 
-            if not isinstance(adapter, AsyncBaseNotificationAdapter):
+            if not is_async_adapter_cls(type(adapter)):
                 return None
 
-            async_adapter = cast(AsyncBaseNotificationAdapter, adapter)
+            async_adapter: AsyncBaseNotificationAdapter = adapter  # type: ignore[assignment]
             try:
                 async_adapter.delayed_send(
                     notification_dict=notification_dict, context_dict=context_dict
@@ -535,11 +538,8 @@ class NotificationService(Generic[A, B]):
                         ) from e
                     raise e
             try:
-                self.notification_backend.mark_pending_as_sent(notification_dict["id"])
-                self.notification_backend.store_context_used(
-                    notification_dict["id"], 
-                    context_dict,
-                    async_adapter.adapter_import_str,
+                self._mark_pending_as_sent(
+                    notification_dict["id"], context_dict, async_adapter.adapter_import_str
                 )
             except NotificationUpdateError as e:
                 raise NotificationMarkSentError("Failed to mark notification as sent") from e
@@ -561,27 +561,21 @@ class AsyncIONotificationService(Generic[AAIO, BAIO]):
         config: Any = None,
     ):
         if isinstance(notification_backend, AsyncIOBaseNotificationBackend):
-            self.notification_backend = cast(BAIO, notification_backend)
+            self.notification_backend = notification_backend  # type: ignore[assignment]
         else:
-            self.notification_backend = cast(
-                BAIO,
-                get_asyncio_notification_backend(
-                    notification_backend, notification_backend_kwargs, config
-                ),
+            self.notification_backend = get_asyncio_notification_backend(  # type: ignore
+                notification_backend, notification_backend_kwargs, config
             )
-        self.notification_backend_import_str = get_class_path(self.notification_backend)
+        self.notification_backend_import_str = self.notification_backend.backend_import_str
 
         if notification_adapters is None or self._check_is_adapters_tuple_iterable(
             notification_adapters
         ):
-            self.notification_adapters = cast(
-                Iterable[AAIO],
-                get_asyncio_notification_adapters(
-                    notification_adapters,
-                    self.notification_backend_import_str,
-                    notification_backend_kwargs if notification_backend_kwargs is not None else {},
-                    config,
-                ),
+            self.notification_adapters = get_asyncio_notification_adapters(  # type: ignore
+                notification_adapters,
+                self.notification_backend_import_str,
+                notification_backend_kwargs if notification_backend_kwargs is not None else {},
+                config,
             )
         elif self._check_is_base_notification_adapter_iterable(notification_adapters):
             self.notification_adapters = notification_adapters
@@ -658,17 +652,30 @@ class AsyncIONotificationService(Generic[AAIO, BAIO]):
                         ) from e
                     raise e
             try:
-                await self.notification_backend.mark_pending_as_sent(notification.id, lock)
-                await self.notification_backend.store_context_used(
-                    notification.id, 
-                    context, 
-                    adapter.adapter_import_str,
-                    lock
+                await self._mark_pending_as_sent(
+                    notification.id, context, adapter.adapter_import_str, lock
                 )
             except NotificationUpdateError as e:
                 raise NotificationMarkSentError("Failed to mark notification as sent") from e
         return None
 
+    async def _mark_pending_as_sent(
+        self,
+        notification_id: int | str | uuid.UUID,
+        context: dict,
+        adapter_import_str: str,
+        lock: asyncio.Lock | None = None,
+    ) -> None:
+        if self.notification_backend.MARK_SENT_STORES_CONTEXT:
+            await self.notification_backend.mark_pending_as_sent(
+                notification_id, lock, context_used=context, adapter_used=adapter_import_str
+            )
+            return
+        await self.notification_backend.mark_pending_as_sent(notification_id, lock)
+        await self.notification_backend.store_context_used(
+            notification_id, context, adapter_import_str, lock
+        )
+
     async def create_notification(
         self,
         user_id: int | str | uuid.UUID,
@@ -5,8 +5,8 @@ from vintasend.services.helpers import (
     get_notification_adapter_cls,
 )
 from vintasend.services.notification_adapters.async_base import (
-    AsyncBaseNotificationAdapter,
     NotificationDict,
+    is_async_adapter_cls,
 )
 from vintasend.services.notification_service import NotificationService
 
@@ -27,7 +27,7 @@ def send_notification(
         adapters[0][0] if isinstance(adapters[0][0], str) else adapters[0][0][0]
     )
     
-    if not issubclass(adapter_cls, AsyncBaseNotificationAdapter):
+    if not is_async_adapter_cls(adapter_cls):
         return
     
     desserialized_backend_kwargs = (
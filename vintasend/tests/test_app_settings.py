@@ -0,0 +1,69 @@
+import os
+from unittest import TestCase
+from unittest.mock import patch
+
+from vintasend.app_settings import (
+    DEFAULT_SETTINGS,
+    FASTAPI_DEFAULT_SETTINGS,
+    clear_settings_cache,
+    get_all_config,
+    get_config,
+    get_setting_with_env_var_fallback,
+)
+
+
+class GetSettingWithEnvVarFallbackTestCase(TestCase):
+    def setUp(self):
+        clear_settings_cache()
+
+    def tearDown(self):
+        clear_settings_cache()
+
+    def test_uses_default_when_framework_value_is_missing(self):
+        assert (
+            get_setting_with_env_var_fallback("NOTIFICATION_DEFAULT_BASE_URL_DOMAIN")
+            == DEFAULT_SETTINGS["NOTIFICATION_DEFAULT_BASE_URL_DOMAIN"]
+        )
+
+    def test_keeps_falsy_framework_value(self):
+        assert get_setting_with_env_var_fallback("NOTIFICATION_DEFAULT_BCC_EMAILS", []) == []
+        assert get_setting_with_env_var_fallback("NOTIFICATION_DEFAULT_FROM_EMAIL", "") == ""
+
+    def test_list_default_is_a_copy(self):
+        bcc_emails = get_setting_with_env_var_fallback("NOTIFICATION_DEFAULT_BCC_EMAILS")
+        bcc_emails.append("test@example.com")
+
+        assert bcc_emails + ["other@example.com"] == ["test@example.com", "other@example.com"]
+        assert DEFAULT_SETTINGS["NOTIFICATION_DEFAULT_BCC_EMAILS"] == []
+
+    def test_env_var_takes_precedence(self):
+        with patch.dict(os.environ, {"NOTIFICATION_DEFAULT_BASE_URL_DOMAIN": "vinta.com.br"}):
+            assert (
+                get_setting_with_env_var_fallback(
+                    "NOTIFICATION_DEFAULT_BASE_URL_DOMAIN", "example.org"
+                )
+                == "vinta.com.br"
+            )
+
+
+class GetAllConfigTestCase(TestCase):
+    def setUp(self):
+        clear_settings_cache()
+
+    def tearDown(self):
+        clear_settings_cache()
+
+    @patch("vintasend.app_settings.detect_framework", return_value="FastAPI")
+    def test_matches_get_config(self, mock_detect_framework):
+        class Config:
+            NOTIFICATION_DEFAULT_BASE_URL_DOMAIN = "vinta.com.br"
+
+        all_config = get_all_config(Config())
+
+        assert all_config["NOTIFICATION_DEFAULT_BASE_URL_DOMAIN"] == "vinta.com.br"
+        assert (
+            all_config["NOTIFICATION_BACKEND"] == FASTAPI_DEFAULT_SETTINGS["NOTIFICATION_BACKEND"]
+        )
+        for setting_name, value in all_config.items():
+            assert value == get_config(setting_name, Config())
+        mock_detect_framework.assert_called()
@@ -0,0 +1,53 @@
+from unittest import TestCase
+
+import pytest
+
+from vintasend.services.dataclasses import NotificationContextDict
+
+
+class NotificationContextDictTestCase(TestCase):
+    def test_rejects_invalid_list_items(self):
+        with pytest.raises(TypeError):
+            NotificationContextDict({"items": [1, 2]})
+
+    def test_rejects_invalid_dict_values(self):
+        with pytest.raises(TypeError):
+            NotificationContextDict({"items": {"a": 1}})
+
+    def test_copy_keeps_values_and_type(self):
+        context = NotificationContextDict(
+            {
+                "name": "test",
+                "items": [NotificationContextDict({"a": 1})],
+                "nested": {"b": NotificationContextDict({"c": "d"})},
+            }
+        )
+
+        copied_context = context.copy()
+
+        assert isinstance(copied_context, NotificationContextDict)
+        assert copied_context == context
+        assert copied_context is not context
+
+    def test_copy_has_its_own_containers(self):
+        context = NotificationContextDict(
+            {
+                "items": [NotificationContextDict({"a": 1})],
+                "nested": {"b": NotificationContextDict({"c": "d"})},
+            }
+        )
+
+        copied_context = context.copy()
+        copied_context["items"].append(NotificationContextDict({"a": 2}))
+        copied_context["nested"]["e"] = NotificationContextDict({"f": "g"})
+
+        assert context["items"] == [NotificationContextDict({"a": 1})]
+        assert context["nested"] == {"b": NotificationContextDict({"c": "d"})}
+
+    def test_from_validated_dict(self):
+        context = NotificationContextDict({"name": "test"})
+
+        new_context = NotificationContextDict.from_validated_dict(context)
+
+        assert isinstance(new_context, NotificationContextDict)
+        assert new_context == {"name": "test"}
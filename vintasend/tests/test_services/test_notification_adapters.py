@@ -0,0 +1,70 @@
+import uuid
+from unittest import TestCase
+
+from vintasend.constants import NotificationStatus, NotificationTypes
+from vintasend.services.notification_adapters.async_base import NotificationDict
+from vintasend.services.notification_adapters.stubs.fake_adapter import (
+    FakeAsyncEmailAdapter,
+    _convert_to_uuid,
+)
+from vintasend.services.notification_backends.stubs.fake_backend import FakeFileBackend
+from vintasend.services.notification_template_renderers.stubs.fake_templated_email_renderer import (
+    FakeTemplateRenderer,
+)
+
+
+def create_notification_dict(title: str = "Test Notification") -> NotificationDict:
+    return NotificationDict(
+        id=str(uuid.uuid4()),
+        user_id=1,
+        notification_type=NotificationTypes.EMAIL.value,
+        title=title,
+        body_template="vintasend_django/emails/test/test_templated_email_body.html",
+        context_name="test_context",
+        context_kwargs={"test": "test"},
+        send_after=None,
+        subject_template="vintasend_django/emails/test/test_templated_email_subject.txt",
+        preheader_template="vintasend_django/emails/test/test_templated_email_preheader.html",
+        status=NotificationStatus.PENDING_SEND.value,
+        context_used=None,
+        adapter_extra_parameters=None,
+    )
+
+
+class FakeAsyncEmailAdapterTestCase(TestCase):
+    def setup_method(self, method):
+        self.backend = FakeFileBackend(database_file_name="adapter-tests-notifications.json")
+
+    def teardown_method(self, method):
+        self.backend.clear()
+
+    def create_adapter(self) -> FakeAsyncEmailAdapter:
+        return FakeAsyncEmailAdapter(FakeTemplateRenderer(), self.backend)
+
+    def test_delayed_send_many_matches_delayed_send(self):
+        jobs = [(create_notification_dict(title), {"test": title}) for title in ("First", "Second")]
+        adapter = self.create_adapter()
+        batch_adapter = self.create_adapter()
+
+        for notification_dict, context_dict in jobs:
+            adapter.delayed_send(notification_dict, context_dict)
+        batch_adapter.delayed_send_many(jobs)
+
+        assert list(batch_adapter.sent_emails) == list(adapter.sent_emails)
+        assert len(batch_adapter.sent_emails) == 2
+
+
+class ConvertToUUIDTestCase(TestCase):
+    def test_converts_serialized_uuids(self):
+        value = uuid.uuid4()
+
+        assert _convert_to_uuid(str(value)) == value
+        assert _convert_to_uuid(value.hex) == value
+        assert _convert_to_uuid(str(value).upper()) == value
+
+    def test_keeps_other_strings(self):
+        misplaced_hyphens = uuid.uuid4().hex + "----"
+
+        assert _convert_to_uuid("test") == "test"
+        assert _convert_to_uuid("g" * 32) == "g" * 32
+        assert _convert_to_uuid(misplaced_hyphens) == misplaced_hyphens
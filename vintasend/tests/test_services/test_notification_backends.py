@@ -0,0 +1,413 @@
+import asyncio
+import datetime
+import os
+import stat
+import uuid
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import patch
+
+import pytest
+
+from vintasend.constants import NotificationStatus, NotificationTypeMask, NotificationTypes
+from vintasend.exceptions import NotificationNotFoundError
+from vintasend.services.dataclasses import Notification, PersistNotificationKwargs
+from vintasend.services.notification_backends.cached import (
+    CachedGetNotificationMixin,
+    CachedInAppUnreadMixin,
+)
+from vintasend.services.notification_backends.stubs.fake_backend import (
+    FakeAsyncIOFileBackend,
+    FakeFileBackend,
+)
+
+
+def create_notification(
+    status: str = NotificationStatus.PENDING_SEND.value,
+    send_after: datetime.datetime | None = None,
+) -> Notification:
+    return Notification(
+        id=str(uuid.uuid4()),
+        user_id=1,
+        notification_type=NotificationTypes.EMAIL.value,
+        title="Test Notification",
+        body_template="vintasend_django/emails/test/test_templated_email_body.html",
+        context_name="test_context",
+        context_kwargs={},
+        send_after=send_after,
+        subject_template="vintasend_django/emails/test/test_templated_email_subject.txt",
+        preheader_template="vintasend_django/emails/test/test_templated_email_preheader.html",
+        status=status,
+    )
+
+
+class FileBackendTestCase(TestCase):
+    def setup_method(self, method):
+        self.backend = FakeFileBackend(database_file_name="backend-tests-notifications.json")
+
+    def teardown_method(self, method):
+        self.backend.clear()
+
+    def test_get_pending_notifications_after(self):
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
+        notifications = [
+            create_notification(send_after=now - datetime.timedelta(minutes=minutes))
+            for minutes in (1, 3, 2)
+        ]
+        self.backend.notifications.extend(notifications)
+
+        first_page = self.backend.get_pending_notifications_after(None, 2)
+        second_page = self.backend.get_pending_notifications_after(first_page.next_cursor, 2)
+
+        assert first_page.items == [notifications[1], notifications[2]]
+        assert first_page.next_cursor is not None
+        assert second_page.items == [notifications[0]]
+        assert second_page.next_cursor is None
+
+    def test_get_pending_notifications_after_with_type_mask(self):
+        email_notification = create_notification()
+        in_app_notification = create_notification()
+        in_app_notification.notification_type = NotificationTypes.IN_APP.value
+        self.backend.notifications.extend([email_notification, in_app_notification])
+
+        page = self.backend.get_pending_notifications_after(
+            None, 10, type_mask=NotificationTypeMask.IN_APP | NotificationTypeMask.SMS
+        )
+
+        assert page.items == [in_app_notification]
+
+    def test_persist_notifications(self):
+        notifications = self.backend.persist_notifications(
+            [
+                PersistNotificationKwargs(
+                    user_id=1,
+                    notification_type=NotificationTypes.EMAIL.value,
+                    title=title,
+                    body_template="vintasend_django/emails/test/test_templated_email_body.html",
+                    context_name="test_context",
+                    context_kwargs={},
+                    send_after=None,
+                    subject_template="vintasend_django/emails/test/test_templated_email_subject.txt",
+                    preheader_template="vintasend_django/emails/test/test_templated_email_preheader.html",
+                )
+                for title in ("First", "Second")
+            ]
+        )
+
+        assert [notification.title for notification in notifications] == ["First", "Second"]
+        assert self.backend.notifications == notifications
+
+    def test_mark_pending_as_sent_many(self):
+        notifications = [create_notification() for _ in range(2)]
+        self.backend.notifications.extend([*notifications, create_notification()])
+
+        sent_notifications = self.backend.mark_pending_as_sent_many(
+            [notification.id for notification in notifications]
+        )
+
+        assert sent_notifications == notifications
+        assert [notification.status for notification in self.backend.notifications] == [
+            NotificationStatus.SENT.value,
+            NotificationStatus.SENT.value,
+            NotificationStatus.PENDING_SEND.value,
+        ]
+
+    def test_get_notifications_by_ids(self):
+        notifications = [create_notification() for _ in range(3)]
+        self.backend.notifications.extend(notifications)
+
+        found = self.backend.get_notifications_by_ids(
+            [notifications[2].id, "missing", notifications[0].id]
+        )
+
+        assert found == {
+            notifications[2].id: notifications[2],
+            notifications[0].id: notifications[0],
+        }
+
+    def test_journaled_changes_are_reloaded(self):
+        notifications = [create_notification() for _ in range(3)]
+        self.backend.notifications.extend(notifications)
+        self.backend._store_notifications()
+        self.backend.mark_pending_as_sent(notifications[0].id)
+        self.backend.cancel_notification(notifications[1].id)
+
+        reloaded_backend = FakeFileBackend(database_file_name="backend-tests-notifications.json")
+
+        assert [(n.id, n.status) for n in reloaded_backend.notifications] == [
+            (notifications[0].id, NotificationStatus.SENT.value),
+            (notifications[2].id, NotificationStatus.PENDING_SEND.value),
+        ]
+        assert reloaded_backend._journal_length == 2
+
+    def test_count_estimates(self):
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
+        self.backend.notifications.extend(
+            [
+                *(create_notification() for _ in range(3)),
+                create_notification(send_after=now + datetime.timedelta(days=1)),
+                create_notification(NotificationStatus.SENT.value),
+            ]
+        )
+
+        assert self.backend.count_pending_estimate() == 3
+        assert self.backend.count_future_estimate() == 1
+
+    def test_store_context_used_keeps_status(self):
+        notification = create_notification(status=NotificationStatus.READ.value)
+        self.backend.notifications.append(notification)
+
+        self.backend.store_context_used(notification.id, {"test": "test"}, "adapter")
+
+        stored = self.backend.get_notification(notification.id)
+        assert stored.status == NotificationStatus.READ.value
+        assert stored.context_used == {"test": "test"}
+        assert stored.adapter_used == "adapter"
+
+    def test_snapshot_keeps_file_mode(self):
+        self.backend._store_notifications()
+        os.chmod(self.backend.database_file_name, 0o644)
+
+        self.backend.notifications.append(create_notification())
+        self.backend._store_notifications()
+
+        assert stat.S_IMODE(os.stat(self.backend.database_file_name).st_mode) == 0o644
+
+    def test_iter_pending_notifications(self):
+        self.backend.ITER_CHUNK_SIZE = 2
+        notifications = [create_notification() for _ in range(5)]
+        self.backend.notifications.extend(notifications)
+
+        assert {notification.id for notification in self.backend.iter_pending_notifications()} == {
+            notification.id for notification in notifications
+        }
+
+
+class CachedFileBackend(CachedGetNotificationMixin, FakeFileBackend):
+    pass
+
+
+class CachedGetNotificationTestCase(TestCase):
+    def setup_method(self, method):
+        self.backend = CachedFileBackend(database_file_name="backend-tests-notifications.json")
+
+    def teardown_method(self, method):
+        self.backend.clear()
+
+    def test_get_notification_is_cached_until_written(self):
+        notification = create_notification()
+        self.backend.notifications.append(notification)
+        fetched_notification = self.backend.get_notification(notification.id)
+        assert fetched_notification == notification
+        assert fetched_notification is not notification
+
+        self.backend.notifications.clear()
+        cached_notification = self.backend.get_notification(notification.id)
+        assert cached_notification == notification
+        cached_notification.context_kwargs["changed"] = True
+        assert self.backend.get_notification(notification.id).context_kwargs == {}
+
+        self.backend.notifications.append(notification)
+        self.backend.mark_pending_as_sent(notification.id)
+        assert notification.status == NotificationStatus.SENT.value
+        self.backend.notifications.clear()
+        with pytest.raises(NotificationNotFoundError):
+            self.backend.get_notification(notification.id)
+
+    def test_read_racing_with_an_invalidation_is_not_cached(self):
+        notification = create_notification()
+        self.backend.notifications.append(notification)
+        get_notification = FakeFileBackend.get_notification
+
+        def racing_get_notification(backend, notification_id, for_update=False):
+            read_notification = get_notification(backend, notification_id, for_update)
+            backend.invalidate_notification(notification_id)
+            return read_notification
+
+        with patch.object(FakeFileBackend, "get_notification", racing_get_notification):
+            self.backend.get_notification(notification.id)
+
+        assert str(notification.id) not in self.backend._notification_cache
+
+
+class CachedInAppUnreadFileBackend(CachedInAppUnreadMixin, FakeFileBackend):
+    pass
+
+
+class CachedInAppUnreadTestCase(TestCase):
+    def setup_method(self, method):
+        self.backend = CachedInAppUnreadFileBackend(
+            database_file_name="backend-tests-notifications.json"
+        )
+
+    def teardown_method(self, method):
+        self.backend.clear()
+
+    def test_stale_ok_returns_cached_page_until_marked_as_read(self):
+        notification = create_notification(NotificationStatus.SENT.value)
+        notification.notification_type = NotificationTypes.IN_APP.value
+        self.backend.notifications.append(notification)
+        assert self.backend.filter_in_app_unread_notifications(1, 1, 10) == [notification]
+
+        other_notification = create_notification(NotificationStatus.SENT.value)
+        other_notification.notification_type = NotificationTypes.IN_APP.value
+        self.backend.notifications.append(other_notification)
+        assert self.backend.filter_in_app_unread_notifications(1, 1, 10, stale_ok=True) == [
+            notification
+        ]
+
+        self.backend.mark_sent_as_read(notification.id)
+        assert self.backend.filter_in_app_unread_notifications(1, 1, 10, stale_ok=True) == [
+            other_notification
+        ]
+
+
+    def test_stale_ok_returns_a_copy_and_drops_it_on_writes(self):
+        notification = create_notification(NotificationStatus.SENT.value)
+        notification.notification_type = NotificationTypes.IN_APP.value
+        self.backend.notifications.append(notification)
+        self.backend.filter_in_app_unread_notifications(1, 1, 10)
+
+        cached_page = self.backend.filter_in_app_unread_notifications(1, 1, 10, stale_ok=True)
+        cached_page.clear()
+        assert self.backend.filter_in_app_unread_notifications(1, 1, 10, stale_ok=True) == [
+            notification
+        ]
+
+        self.backend.persist_notification_update(notification.id, {"title": "Updated"})
+        assert ("1", 10) not in self.backend._unread_cache
+
+        self.backend.filter_in_app_unread_notifications(1, 1, 10)
+        self.backend.cancel_notification(notification.id)
+        assert self.backend.filter_in_app_unread_notifications(1, 1, 10, stale_ok=True) == []
+
+    def test_fetch_racing_with_an_invalidation_is_not_cached(self):
+        notification = create_notification(NotificationStatus.SENT.value)
+        notification.notification_type = NotificationTypes.IN_APP.value
+        self.backend.notifications.append(notification)
+        filter_unread = FakeFileBackend.filter_in_app_unread_notifications
+
+        def racing_filter_unread(backend, user_id, page, page_size):
+            page_notifications = list(filter_unread(backend, user_id, page, page_size))
+            backend.mark_sent_as_read(notification.id)
+            return page_notifications
+
+        with patch.object(
+            FakeFileBackend, "filter_in_app_unread_notifications", racing_filter_unread
+        ):
+            self.backend.filter_in_app_unread_notifications(1, 1, 10)
+
+        assert self.backend.filter_in_app_unread_notifications(1, 1, 10, stale_ok=True) == []
+
+    def test_background_refresh_and_close(self):
+        notification = create_notification(NotificationStatus.SENT.value)
+        notification.notification_type = NotificationTypes.IN_APP.value
+        self.backend.notifications.append(notification)
+        self.backend.UNREAD_CACHE_REFRESH_AFTER = 0.0
+        self.backend.filter_in_app_unread_notifications(1, 1, 10)
+
+        self.backend.filter_in_app_unread_notifications(1, 1, 10, stale_ok=True)
+        self.backend.close()
+
+        assert self.backend._unread_refresh_executor is None
+        assert not self.backend._unread_refreshing
+
+
+class InFlightAsyncIOFileBackend(FakeAsyncIOFileBackend):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def mark_pending_as_sent(
+        self, notification_id, lock=None, context_used=None, adapter_used=None
+    ):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0)
+            return await super().mark_pending_as_sent(
+                notification_id, lock, context_used, adapter_used
+            )
+        finally:
+            self.in_flight -= 1
+
+
+class AsyncIOFileBackendTestCase(IsolatedAsyncioTestCase):
+    def setup_method(self, method):
+        self.backend = FakeAsyncIOFileBackend(database_file_name="backend-tests-notifications.json")
+
+    def teardown_method(self, method):
+        FakeFileBackend(database_file_name="backend-tests-notifications.json").clear()
+
+    @pytest.mark.asyncio
+    async def test_iter_pending_columns(self):
+        pending_notifications = [create_notification() for _ in range(3)]
+        self.backend.notifications.extend(
+            [*pending_notifications, create_notification(NotificationStatus.SENT.value)]
+        )
+
+        pages = [page async for page in self.backend.iter_pending_columns(page_size=2)]
+
+        assert [len(page["id"]) for page in pages] == [2, 1]
+        assert [notification_id for page in pages for notification_id in page["id"]] == [
+            notification.id for notification in pending_notifications
+        ]
+        assert pages[0]["status"] == [NotificationStatus.PENDING_SEND.value] * 2
+
+    @pytest.mark.asyncio
+    async def test_iter_pending_columns_while_marking_as_sent(self):
+        notifications = [create_notification() for _ in range(10)]
+        self.backend.notifications.extend(notifications)
+
+        seen_ids = []
+        async for page in self.backend.iter_pending_columns(page_size=3):
+            for notification_id in page["id"]:
+                seen_ids.append(notification_id)
+                await self.backend.mark_pending_as_sent(notification_id)
+
+        assert seen_ids == [notification.id for notification in notifications]
+
+    @pytest.mark.asyncio
+    async def test_mark_pending_as_sent_many(self):
+        notifications = [create_notification() for _ in range(2)]
+        self.backend.notifications.extend(notifications)
+
+        sent_notifications = await self.backend.mark_pending_as_sent_many(
+            [notification.id for notification in notifications]
+        )
+
+        assert [notification.id for notification in sent_notifications] == [
+            notification.id for notification in notifications
+        ]
+        assert all(
+            notification.status == NotificationStatus.SENT.value
+            for notification in self.backend.notifications
+        )
+
+    @pytest.mark.asyncio
+    async def test_many_methods_await_one_call_at_a_time(self):
+        backend = InFlightAsyncIOFileBackend(database_file_name="backend-tests-notifications.json")
+        notifications = [create_notification() for _ in range(4)]
+        backend.notifications.extend(notifications)
+
+        await backend.mark_pending_as_sent_many(
+            [notification.id for notification in notifications]
+        )
+
+        assert backend.max_in_flight == 1
+
+    @pytest.mark.asyncio
+    async def test_many_methods_with_many_concurrency(self):
+        backend = InFlightAsyncIOFileBackend(database_file_name="backend-tests-notifications.json")
+        backend.MANY_CONCURRENCY = 2
+        notifications = [create_notification() for _ in range(4)]
+        backend.notifications.extend(notifications)
+
+        sent_notifications = await backend.mark_pending_as_sent_many(
+            [notification.id for notification in notifications]
+        )
+
+        assert backend.max_in_flight == 2
+        assert [notification.id for notification in sent_notifications] == [
+            notification.id for notification in notifications
+        ]
@@ -55,6 +55,14 @@ def notification_to_dict(notification: "Notification") -> NotificationDict:
         adapter_extra_parameters=notification.adapter_extra_parameters,
     )
 
+
+class LegacyMarkSentFileBackend(FakeFileBackend):
+    MARK_SENT_STORES_CONTEXT = False
+
+    def mark_pending_as_sent(self, notification_id):
+        return super().mark_pending_as_sent(notification_id)
+
+
 class NotificationServiceTestCase(TestCase):
     def setup_method(self, method):
         register_context("test_context")(self.create_notification_context)
@@ -214,6 +222,35 @@ class NotificationServiceTestCase(TestCase):
         assert sent_notification.status == NotificationStatus.SENT.value
         assert sent_notification.context_used == {"test": "test"}
 
+    def test_send_with_backend_without_context_used(self):
+        notification_service = NotificationService(
+            notification_adapters=[
+                (
+                    "vintasend.services.notification_adapters.stubs.fake_adapter.FakeEmailAdapter",
+                    "vintasend.services.notification_template_renderers.stubs.fake_templated_email_renderer.FakeTemplateRenderer",
+                )
+            ],
+            notification_backend="vintasend.tests.test_services.test_notification_service.LegacyMarkSentFileBackend",
+            notification_backend_kwargs={"database_file_name": "service-tests-notifications.json"},
+        )
+
+        notification = notification_service.create_notification(
+            user_id=1,
+            notification_type=NotificationTypes.EMAIL.value,
+            title="Test Notification",
+            body_template="vintasend_django/emails/test/test_templated_email_body.html",
+            context_name="test_context",
+            context_kwargs=NotificationContextDict({"test": "test"}),
+            send_after=None,
+            subject_template="vintasend_django/emails/test/test_templated_email_subject.txt",
+            preheader_template="vintasend_django/emails/test/test_templated_email_preheader.html",
+        )
+
+        sent_notification = notification_service.get_notification(notification.id)
+        assert sent_notification.status == NotificationStatus.SENT.value
+        assert sent_notification.context_used == {"test": "test"}
+        assert sent_notification.adapter_used == FakeEmailAdapter.adapter_import_str
+
     def test_create_notification(self):
         assert len(self.notification_service.notification_backend.notifications) == 0
         notification = self.notification_service.create_notification(
@@ -994,6 +1031,19 @@ class NotificationServiceTestCase(TestCase):
                 notification_backend_kwargs={},
             )
 
+    def test_use_backend_missing_from_module(self):
+        with pytest.raises(ValueError):
+            NotificationService(
+                notification_adapters=[
+                    (
+                        "vintasend.services.notification_adapters.stubs.fake_adapter.FakeEmailAdapter",
+                        "vintasend.services.notification_template_renderers.stubs.fake_templated_email_renderer.FakeTemplateRenderer",
+                    )
+                ],
+                notification_backend="vintasend.services.notification_backends.stubs.fake_backend.MissingBackend",
+                notification_backend_kwargs={},
+            )
+
     def test_use_invalid_adapter(self):
         with pytest.raises(ValueError):
             NotificationService(
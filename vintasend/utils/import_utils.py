@@ -0,0 +1,16 @@
+import importlib
+import sys
+from typing import Any
+
+
+def import_class(import_string: str) -> Any:
+    module_name, class_name = import_string.rsplit(".", 1)
+    # modules that were already imported are served straight from sys.modules without going
+    # through the import machinery
+    module = sys.modules.get(module_name)
+    if module is None:
+        module = importlib.import_module(module_name)
+    try:
+        return getattr(module, class_name)
+    except AttributeError as e:
+        raise ImportError(f'Module "{module_name}" does not define "{class_name}"') from e
@@ -1,20 +1,27 @@
-from types import MappingProxyType
+import threading
 from typing import Any, Generic, TypeVar, cast
 
 
 class BaseSingletonMeta(type):
-    _instances: MappingProxyType[Any, Any]
+    _instance: Any
 
 
 T = TypeVar('T', bound=BaseSingletonMeta)
 
 
 class SingletonMeta(Generic[T], BaseSingletonMeta):
-    _instances: MappingProxyType["SingletonMeta[T]", T] = MappingProxyType({})
+    _lock = threading.RLock()
 
     def __call__(cls, *args: Any, **kwargs: Any) -> T:
-        if cls not in cls._instances:
-            _instances: dict["SingletonMeta[T]", T] = dict(cls._instances)
-            _instances[cls] = cast(T, super().__call__(*args, **kwargs))
-            cls._instances = MappingProxyType(_instances)
-        return cls._instances[cls]
+        # the instance is read from the class' own __dict__ so subclasses of a singleton get
+        # their own instance instead of inheriting the parent's one
+        instance = cls.__dict__.get("_instance")
+        if instance is None:
+            # double-checked so only the first instantiation pays for the lock and concurrent
+            # first calls don't end up running __init__ more than once
+            with cls._lock:
+                instance = cls.__dict__.get("_instance")
+                if instance is None:
+                    instance = cast(T, super().__call__(*args, **kwargs))
+                    cls._instance = instance
+        return instance